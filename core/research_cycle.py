@@ -14,17 +14,16 @@ The pattern is always the same:
 This is the core loop. Everything else is just setup/teardown.
 """
 
-import os
 import asyncio
-from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional
 
 from core.session import ResearchSession
 from workers.research import execute_research
 from utils.files import (
     format_conversation_for_display,
     convert_tasking_to_conversation,
-    distill_conversation
+    distill_conversation,
+    save_refinement_files
 )
 from graph.client import GraphClient
 
@@ -33,7 +32,8 @@ async def run_research_cycle(
     session: ResearchSession,
     graph_client: GraphClient,
     query: str,
-    tasking_summary: str = ""
+    tasking_summary: str = "",
+    refinement_conversation: Optional[List[Dict]] = None
 ) -> Dict:
     """
     Execute one complete research cycle.
@@ -43,6 +43,9 @@ async def run_research_cycle(
         graph_client: Graph connection
         query: What to research
         tasking_summary: Why we're researching this (from tasking/refinement conversation)
+        refinement_conversation: Deep research only - the conversation that led to it.
+            Defaults to session.pending_refinement; pass a snapshot when several
+            topics share one conversation (the first cycle clears pending_refinement)
 
     Returns:
         Dict with status, episode_name, episode_count
@@ -65,14 +68,15 @@ async def run_research_cycle(
     # Step 1: Create research directory
     # ========================================
     # Need to create directory BEFORE research (workers save files during execution)
-    episode_name = query
-    research_dir = session.next_episode_dir(episode_name)
-    os.makedirs(research_dir, exist_ok=True)
+    # Re-researched topics get a numbered episode instead of overwriting the earlier one
+    episode_name = session.next_episode_name(query)
+    research_dir = session.episode_dir(episode_name)
+    session.ensure_dir(research_dir)
 
     # ========================================
     # Step 2: Execute research (saves worker files + critical to research_dir)
     # ========================================
-    worker_results, critical_analysis = execute_research(query, tasking_summary, research_dir)
+    worker_results, critical_analysis = await execute_research(query, tasking_summary, research_dir)
 
     # ========================================
     # Step 2: Prepare refinement context
@@ -90,13 +94,15 @@ async def run_research_cycle(
             conversation_for_distillation = convert_tasking_to_conversation(session.tasking_context)
             conversation_for_display = format_conversation_for_display(conversation_for_distillation)
     else:
-        # Deep research: use pending refinement
-        conversation_for_distillation = session.pending_refinement
-        conversation_for_display = format_conversation_for_display(session.pending_refinement)
+        # Deep research: use pending refinement (or the caller's snapshot of it)
+        if refinement_conversation is None:
+            refinement_conversation = session.pending_refinement
+        conversation_for_distillation = refinement_conversation
+        conversation_for_display = format_conversation_for_display(refinement_conversation)
 
     # Distill conversation to extract signal/gold
     print("[DISTILLING] Extracting gold from conversation...")
-    refinement_distilled = distill_conversation(conversation_for_distillation)
+    refinement_distilled = await asyncio.to_thread(distill_conversation, conversation_for_distillation)
 
     # ========================================
     # Step 3: Save refinement files to disk
@@ -104,26 +110,11 @@ async def run_research_cycle(
     # Worker files and critical analysis already saved during research execution
     # Just need to save refinement context files
 
+    # File writes don't depend on the graph commit - run them alongside it (Step 4)
     print(f"[REFINEMENT] Saving refinement context...")
-
-    # Save full refinement context (audit trail)
-    with open(os.path.join(research_dir, "refinement_context.txt"), 'w', encoding='utf-8') as f:
-        f.write("REFINEMENT CONTEXT - Full Conversation (Audit Trail)\n")
-        f.write("="*80 + "\n")
-        f.write("This is the full conversation that led to this research being executed.\n")
-        f.write("For the distilled version (what goes to graph), see refinement_distilled.txt\n")
-        f.write("="*80 + "\n\n")
-        f.write(conversation_for_display)
-
-    # Save distilled refinement (what goes to graph as Episode 5)
-    with open(os.path.join(research_dir, "refinement_distilled.txt"), 'w', encoding='utf-8') as f:
-        f.write("REFINEMENT CONTEXT - Distilled (Committed to Graph)\n")
-        f.write("="*80 + "\n")
-        f.write("This is the extracted gold/signal from the conversation.\n")
-        f.write("This version is committed to the knowledge graph as Episode 5.\n")
-        f.write("WEIGHTING: This context is weighted HIGHER than raw research findings.\n")
-        f.write("="*80 + "\n\n")
-        f.write(refinement_distilled)
+    save_task = asyncio.create_task(asyncio.to_thread(
+        save_refinement_files, research_dir, conversation_for_display, refinement_distilled
+    ))
 
     # ========================================
     # Step 4: Commit to knowledge graph
@@ -132,31 +123,43 @@ async def run_research_cycle(
     # Enables cross-session entity synthesis and "omega context" search
     group_id = "helldiver_research"
 
+    # Make sure session state is on disk before the long graph commit
+    await asyncio.to_thread(session.flush)
+
     print(f"[GRAPH] Committing to knowledge graph (group_id: {group_id})...")
-    result = await graph_client.commit_research_episode(
-        session_name=session.original_query,
-        episode_name=episode_name,
-        group_id=group_id,
-        worker_results=worker_results,
-        critical_analysis=critical_analysis,
-        refinement_distilled=refinement_distilled
+    result, _ = await asyncio.gather(
+        graph_client.commit_research_episode(
+            session_name=session.original_query,
+            episode_name=episode_name,
+            group_id=group_id,
+            worker_results=worker_results,
+            critical_analysis=critical_analysis,
+            refinement_distilled=refinement_distilled
+        ),
+        save_task
     )
 
     if result["status"] == "success":
         print(f"[SUCCESS] Research complete: {result['episode_count']} episodes committed")
+    elif result["status"] == "skipped":
+        print(f"[SKIPPED] Nothing committed: all {len(result['skipped'])} episodes matched the dedup cache "
+              f"(set HELLDIVER_EPISODE_DEDUP=0 or delete it if the graph was wiped)")
     else:
         print(f"[WARN] Graph commit had errors: {result.get('errors', [])}")
 
     # ========================================
     # Step 5: Update session state
     # ========================================
-    session.episode_count += 1
-    session.episode_name = episode_name
-    session.research_findings = worker_results
-    session.query = query  # Update current query
-    session.clear_refinement()  # Clear pending refinement (it's been saved)
-    session.state = "REFINEMENT"  # Back to refinement state
-    session.save()
+    with session.batched_save():  # One write for all updates below
+        session.episode_count += 1
+        session.episode_name = episode_name
+        if episode_name not in session.episode_names:  # Re-researched topic: keep one entry
+            session.episode_names = session.episode_names + [episode_name]
+        session.research_findings = worker_results
+        session.remember_research_findings(research_dir, worker_results, critical_analysis)
+        session.query = query  # Update current query
+        session.clear_refinement()  # Clear pending refinement (it's been saved)
+        session.state = "REFINEMENT"  # Back to refinement state
 
     return {
         "status": result["status"],
@@ -8,11 +8,81 @@ Session lifecycle:
     TASKING → RESEARCH → REFINEMENT → (RESEARCH → REFINEMENT)* → COMPLETE
 """
 
+import atexit
+import hashlib
 import json
 import os
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, List, Dict
 
+# orjson (optional) encodes several times faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Episode name -> directory name: spaces and path separators become underscores (one pass)
+SAFE_NAME_TABLE = str.maketrans({" ": "_", "/": "_", "\\": "_"})
+
+# Files loaded as research context for refinement (in display order)
+RESEARCH_FILES = ["academic_researcher.txt", "industry_intelligence.txt", "tool_analyzer.txt", "critical_analysis.txt"]
+RESEARCH_FILE_SET = frozenset(RESEARCH_FILES)
+
+# Same file as workers.research.BATCH_STATE_FILE: present while a batch is in
+# flight, so a folder holding it belongs to research that can still resume
+BATCH_STATE_FILE = "batch_state.json"
+
+# Append-only log of the refinement conversation since the last research
+# (one JSON record per line), so recording a turn never rewrites session.json
+REFINEMENT_LOG_FILE = "refinement_pending.jsonl"
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson if installed, else stdlib json)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+# Background writer for session files: callers serialize on their own thread
+# and hand the bytes off, so disk I/O never blocks the conversation loop.
+# One FIFO thread keeps appends and rewrites of the same file in order.
+_write_queue = queue.Queue()
+
+
+def _writer_loop():
+    """Drain the write queue: append, or replace atomically (temp file + rename)."""
+    while True:
+        path, payload, append = _write_queue.get()
+        try:
+            if append:
+                with open(path, 'ab') as f:
+                    f.write(payload)
+            else:
+                tmp_path = path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[ERROR] Failed to save {path}: {e}")
+        finally:
+            _write_queue.task_done()
+
+
+threading.Thread(target=_writer_loop, name="session-writer", daemon=True).start()
+
+# Daemon thread dies with the process - make sure pending writes land first
+atexit.register(_write_queue.join)
+
+# Fields persisted to session.json - assigning a new value marks the session dirty
+_PERSISTED_FIELDS = frozenset({
+    "query", "original_query", "state", "episode_count", "episode_name",
+    "episode_names", "tasking_context", "episode_name_cache"
+})
+
 
 class ResearchSession:
     """
@@ -35,8 +105,14 @@ class ResearchSession:
         query: str,
         state: str = "TASKING"
     ):
+        # Persistence bookkeeping (set first - __setattr__ relies on them)
+        self._dirty = True  # Unsaved changes since last save()
+        self._batch_depth = 0  # >0 while inside batched_save()
+
         # Core identification
         self.session_dir = session_dir  # Where all files live
+        self._session_file = os.path.join(session_dir, "session.json")  # Computed once, used by every save()
+        self._refinement_log = os.path.join(session_dir, REFINEMENT_LOG_FILE)
         self.query = query  # Current research focus
         self.original_query = query  # Never changes - what user originally asked
 
@@ -46,35 +122,93 @@ class ResearchSession:
         # Episode tracking (what we've researched so far)
         self.episode_count = 0  # Total research episodes executed
         self.episode_name = ""  # Clean name for current episode (e.g., "Custom entities for Graphiti")
+        self.episode_names = []  # All completed episodes in order (initial first, then deep dives)
 
         # Conversation context (the refinement between researches)
         self.tasking_context = {}  # Initial conversation that defined the research
-        self.pending_refinement = []  # Conversation since last research
+        self.pending_refinement = []  # Conversation since last research (persisted to REFINEMENT_LOG_FILE)
 
         # Research outputs (what we found)
         self.narrative = ""  # Synthesized findings from last research
         self.research_findings = {}  # Raw worker outputs from last research
 
+        # Approved episode names: {query_hash: name} - skips LLM naming on repeat topics
+        self.episode_name_cache = {}
+
+        # File cache: {file_path: (mtime, content)} - skips re-reading unchanged files
+        self._file_cache = {}
+
+        # Excerpts of research run in this process: {research_dir: excerpts} - no disk reads at all
+        self._findings_cache = {}
+
+        # Directories already created this run - skips repeat makedirs syscalls
+        self._dirs_created = set()
+
+    def __setattr__(self, name, value):
+        """Mark the session dirty when a persisted field gets a different value."""
+        if name in _PERSISTED_FIELDS and getattr(self, name, None) != value:
+            object.__setattr__(self, "_dirty", True)
+        object.__setattr__(self, name, value)
+
     def save(self):
         """
         Persist session state to disk.
 
         Why: Sessions can be resumed across restarts, continuity matters.
-        Where: session_dir/session.json
-        """
-        session_file = os.path.join(self.session_dir, "session.json")
-
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "query": self.query,
-                "original_query": self.original_query,
-                "state": self.state,
-                "episode_count": self.episode_count,
-                "episode_name": self.episode_name,
-                "tasking_context": self.tasking_context,
-                "pending_refinement": self.pending_refinement,
-                "created_at": datetime.now().isoformat()
-            }, f, indent=2)
+        Where: session_dir/session.json (written by the background writer thread).
+        Refinement turns are appended to REFINEMENT_LOG_FILE as they happen
+        instead, so this write doesn't grow with the conversation.
+
+        Skipped when nothing persisted has changed since the last save, or
+        while inside batched_save() (which saves once on exit).
+        """
+        if self._batch_depth or not self._dirty:
+            return
+
+        payload = _dumps({
+            "query": self.query,
+            "original_query": self.original_query,
+            "state": self.state,
+            "episode_count": self.episode_count,
+            "episode_name": self.episode_name,
+            "episode_names": self.episode_names,
+            "tasking_context": self.tasking_context,
+            "episode_name_cache": self.episode_name_cache,
+            "created_at": datetime.now().isoformat()
+        }, indent=True)
+
+        _write_queue.put((self._session_file, payload, False))
+        self._dirty = False
+
+    @contextmanager
+    def batched_save(self):
+        """
+        Coalesce several updates into a single save.
+
+        Usage:
+            with session.batched_save():
+                session.state = "REFINEMENT"
+                session.episode_count += 1
+                session.save()  # deferred
+            # one write here (if anything changed)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.save()
+
+    @staticmethod
+    def flush():
+        """
+        Block until all queued session writes are on disk.
+
+        When: Before steps that may crash or take long (e.g. graph commits),
+        so the last saved state is durable.
+        """
+        _write_queue.join()
 
     @staticmethod
     def load(session_dir: str) -> 'ResearchSession':
@@ -92,11 +226,12 @@ class ResearchSession:
         """
         session_file = os.path.join(session_dir, "session.json")
 
-        if not os.path.exists(session_file):
-            raise FileNotFoundError(f"No session.json in {session_dir}")
-
-        with open(session_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Open directly (no exists() probe) - one syscall instead of two
+        try:
+            with open(session_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No session.json in {session_dir}") from None
 
         # Create session with loaded data
         session = ResearchSession(
@@ -109,11 +244,116 @@ class ResearchSession:
         session.original_query = data.get("original_query", data.get("query", ""))
         session.episode_count = data.get("episode_count", 0)
         session.episode_name = data.get("episode_name", "")
+        # Older sessions only recorded the latest episode
+        session.episode_names = data.get("episode_names", [session.episode_name] if session.episode_name else [])
         session.tasking_context = data.get("tasking_context", {})
-        session.pending_refinement = data.get("pending_refinement", [])
+        session.pending_refinement = session._load_refinement_log(data.get("pending_refinement", []))
+        session.episode_name_cache = data.get("episode_name_cache", {})
+        session._dirty = False  # Matches what's on disk
 
         return session
 
+    def _load_refinement_log(self, fallback: List[Dict]) -> List[Dict]:
+        """
+        Rebuild pending_refinement from REFINEMENT_LOG_FILE.
+
+        Records are turns, or {"turn_index", "assistant_digest"} updates to an
+        earlier turn. Sessions saved before the log existed keep their turns in
+        session.json - those are passed in as fallback and migrated into the
+        log right away, since save() no longer writes them and later turns
+        are only appended to the log.
+        """
+        try:
+            with open(self._refinement_log, 'rb') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            if fallback:
+                # Queued before any append, so the FIFO writer keeps legacy turns first
+                payload = b"".join(_dumps(turn) + b"\n" for turn in fallback)
+                _write_queue.put((self._refinement_log, payload, False))
+            return fallback
+
+        loads = orjson.loads if orjson is not None else json.loads
+        turns = []
+        for line in lines:
+            if not line.strip():
+                continue
+            record = loads(line)
+            if "turn_index" in record:
+                if record["turn_index"] < len(turns):
+                    turns[record["turn_index"]]["assistant_digest"] = record["assistant_digest"]
+            else:
+                turns.append(record)
+        return turns
+
+    def _append_refinement_record(self, record: Dict):
+        """Queue one record for REFINEMENT_LOG_FILE (O(1) per turn, no rewrite)."""
+        _write_queue.put((self._refinement_log, _dumps(record) + b"\n", True))
+
+    def load_research_findings(self, research_dir: str) -> str:
+        """
+        Load research file excerpts for the refinement conversation.
+
+        Args:
+            research_dir: Episode folder containing worker + critical files
+
+        Returns:
+            Concatenated excerpts (first 2000 chars per file)
+
+        Why cached: Called on every refinement phase. Files are only re-read
+        when their mtime changes, so unchanged research costs one directory
+        scan plus one stat per file.
+        """
+        # Research run in this process - excerpts were built from the in-memory results
+        cached_findings = self._findings_cache.get(research_dir)
+        if cached_findings is not None:
+            return cached_findings
+
+        parts = []
+
+        # One directory read instead of a stat probe per expected file
+        try:
+            with os.scandir(research_dir) as entries:
+                present = {entry.name: entry for entry in entries if entry.name in RESEARCH_FILE_SET}
+        except FileNotFoundError:
+            return ""
+
+        for worker_file in RESEARCH_FILES:  # Iterate the list to keep display order
+            entry = present.get(worker_file)
+            if entry is None:
+                continue
+
+            file_path = entry.path
+            mtime = entry.stat().st_mtime
+
+            cached = self._file_cache.get(file_path)
+            if cached and cached[0] == mtime:
+                content = cached[1]
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                self._file_cache[file_path] = (mtime, content)
+
+            parts.append(f"\n\n=== {worker_file} ===\n{content[:2000]}")  # First 2000 chars
+
+        return "".join(parts)
+
+    def remember_research_findings(self, research_dir: str, worker_results: Dict[str, str], critical_analysis: str):
+        """
+        Build the refinement excerpts straight from a research cycle's results.
+
+        Why: The research cycle already holds every worker's text in memory,
+        so the refinement phase right after it doesn't need to read the
+        files it just wrote. Resumed sessions (--refine) still load from disk.
+        """
+        texts = dict(worker_results, critical_analysis=critical_analysis)
+        parts = []
+        for worker_file in RESEARCH_FILES:
+            content = texts.get(worker_file[:-len(".txt")])
+            if content:
+                parts.append(f"\n\n=== {worker_file} ===\n{content[:2000]}")  # First 2000 chars
+        self._findings_cache[research_dir] = "".join(parts)
+
     def add_refinement_turn(self, user_input: str, assistant_response: str):
         """
         Record one turn of refinement conversation.
@@ -124,12 +364,33 @@ class ResearchSession:
         Args:
             user_input: What the user said
             assistant_response: How we responded
+
+        Returns:
+            The recorded turn dict
         """
-        self.pending_refinement.append({
+        turn = {
             "user_input": user_input,
             "assistant_response": assistant_response,
             "timestamp": datetime.now().isoformat()
-        })
+        }
+        self.pending_refinement.append(turn)
+        self._append_refinement_record(turn)
+        return turn
+
+    def set_assistant_digest(self, turn: Dict, digest: str):
+        """
+        Attach a short digest of a long assistant response to a refinement turn.
+
+        Why: The refinement loop re-sends history every turn; digests keep
+        that history small. The full response stays in assistant_response.
+        """
+        turn["assistant_digest"] = digest
+
+        # Turn may already be gone (research started and cleared the log)
+        for index, pending in enumerate(self.pending_refinement):
+            if pending is turn:
+                self._append_refinement_record({"turn_index": index, "assistant_digest": digest})
+                break
 
     def clear_refinement(self):
         """
@@ -139,10 +400,41 @@ class ResearchSession:
         When: Called after each research execution.
         """
         self.pending_refinement = []
+        _write_queue.put((self._refinement_log, b"", False))  # Truncate the log
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        """Stable cache key for a research query (case/whitespace-insensitive)."""
+        return hashlib.blake2b(query.strip().lower().encode('utf-8'), digest_size=16).hexdigest()
+
+    def cached_episode_name(self, query: str) -> Optional[str]:
+        """Return the episode name previously approved for this query, if any."""
+        return self.episode_name_cache.get(self._query_key(query))
 
-    def next_episode_dir(self, topic: str) -> str:
+    def cache_episode_name(self, query: str, episode_name: str):
         """
-        Generate directory path for next research episode.
+        Remember the approved episode name for a query.
+
+        Persisted in session.json on the next save().
+        """
+        self.episode_name_cache[self._query_key(query)] = episode_name
+        self._dirty = True
+
+    def ensure_dir(self, path: str):
+        """
+        Create a directory (and parents) once per session.
+
+        Why: os.makedirs(exist_ok=True) still stats every path component.
+        Remembering what we created skips that on repeat calls.
+        """
+        if path in self._dirs_created:
+            return
+        os.makedirs(path, exist_ok=True)
+        self._dirs_created.add(path)
+
+    def episode_dir(self, topic: str) -> str:
+        """
+        Directory path for a research episode.
 
         Args:
             topic: Clean topic name (e.g., "Custom entities for Graphiti")
@@ -152,6 +444,78 @@ class ResearchSession:
 
         Why: Each research gets its own folder with 5 files (3 workers + 1 critical + 1 refinement)
         """
-        # Use EXACT same logic as old code - just replace spaces and slashes
-        safe_name = topic.replace(" ", "_").replace("/", "_")
+        # Same logic as old code (replace spaces and slashes), single translate pass
+        safe_name = topic.translate(SAFE_NAME_TABLE)
         return os.path.join(self.session_dir, safe_name)
+
+    def next_episode_name(self, topic: str) -> str:
+        """
+        Episode name for new research on a topic, without reusing a finished episode's folder.
+
+        Returns:
+            topic itself, or "topic 2", "topic 3", ... if earlier research on the
+            same topic already fills that folder
+
+        Why: Re-researching a topic (e.g. a memoized episode name) would
+        otherwise overwrite the earlier episode's files. A folder whose batch
+        is still pending (batch_state.json) is reused so the run can resume it.
+        """
+        episode_name = topic
+        suffix = 1
+        while self._episode_dir_taken(self.episode_dir(episode_name)):
+            suffix += 1
+            episode_name = f"{topic} {suffix}"
+        return episode_name
+
+    @staticmethod
+    def _episode_dir_taken(path: str) -> bool:
+        """True if path holds research output that isn't waiting on a pending batch."""
+        try:
+            with os.scandir(path) as entries:
+                names = {entry.name for entry in entries}
+        except FileNotFoundError:
+            return False
+        return BATCH_STATE_FILE not in names and not RESEARCH_FILE_SET.isdisjoint(names)
+
+
+# Cross-session episode names: {query_key: {"suggested": ..., "approved": ...}}.
+# The per-session cache only covers one session. This one also covers new
+# sessions and --refine reloads that research a topic named before.
+EPISODE_NAME_CACHE_FILE = os.path.join("context", "_episode_name_cache.json")
+_global_names = None  # Loaded on first use
+
+
+def _global_name_cache() -> Dict:
+    """Load the cross-session name cache once per process."""
+    global _global_names
+    if _global_names is None:
+        try:
+            with open(EPISODE_NAME_CACHE_FILE, 'rb') as f:
+                _global_names = json.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            _global_names = {}
+    return _global_names
+
+
+def global_episode_name(query: str) -> Optional[Dict]:
+    """Return {"suggested", "approved"} from an earlier session for this query, if any."""
+    return _global_name_cache().get(ResearchSession._query_key(query))
+
+
+def remember_global_episode_name(query: str, suggested: Optional[str], approved: str):
+    """
+    Record an approved episode name for future sessions (written in the background).
+
+    suggested=None keeps the recorded suggestion (the name came from this
+    cache, not from the model), so only the approved name is updated.
+    """
+    cache = _global_name_cache()
+    key = ResearchSession._query_key(query)
+    if suggested is None:
+        suggested = cache.get(key, {}).get("suggested", approved)
+    entry = {"suggested": suggested, "approved": approved}
+    if cache.get(key) == entry:
+        return
+    cache[key] = entry
+    os.makedirs(os.path.dirname(EPISODE_NAME_CACHE_FILE), exist_ok=True)
+    _write_queue.put((EPISODE_NAME_CACHE_FILE, _dumps(cache, indent=True), False))
@@ -16,8 +16,12 @@ Why 5 episodes per research:
 
 import os
 import asyncio
+import functools
+import hashlib
+import inspect
+import sqlite3
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -31,6 +35,24 @@ except ImportError:
     GRAPHITI_AVAILABLE = False
     Graphiti = None
 
+# Bulk ingestion (add_episode_bulk) - older graphiti_core versions don't have it
+try:
+    from graphiti_core.nodes import EpisodeType
+    from graphiti_core.utils.bulk_utils import RawEpisode
+    BULK_AVAILABLE = True
+except ImportError:
+    BULK_AVAILABLE = False
+
+# Success marker for episode logs. Set HELLDIVER_ASCII_LOGS=1 to keep output
+# plain ASCII (e.g. Windows consoles, log files piped through non-UTF-8 tools)
+OK_MARK = "OK" if os.environ.get("HELLDIVER_ASCII_LOGS") == "1" else "✓"
+
+# Content hashes of committed episode bodies -> episode name. Opt-in
+# (HELLDIVER_EPISODE_DEDUP=1): identical text is then never sent to Graphiti twice
+# (each commit costs many entity-extraction LLM calls). Hashes are keyed on the
+# Neo4j URI and group, but the file can't see a wiped database - delete it then.
+EPISODE_HASH_DB = os.path.join("context", "_episode_hash_cache.sqlite")
+
 # Import ontology configuration for custom entity/edge extraction
 from .ontology import ENTITY_TYPES, EDGE_TYPES, EDGE_TYPE_MAP
 
@@ -89,6 +111,20 @@ class GraphClient:
         self._user = os.environ.get("NEO4J_USER", "neo4j")
         self._password = os.environ.get("NEO4J_PASSWORD", "password")
         self._indexes_built = False  # Track if indexes are created
+        # Max episodes committed at once (see commit_many). Default 1 = sequential:
+        # Graphiti's entity resolution expects one add_episode at a time per group
+        # (concurrent commits create duplicate entities), and each add_episode fans
+        # out into many LLM calls (see SEMAPHORE_LIMIT=1). Raising it is opt-in.
+        self._max_concurrency = int(os.environ.get("HELLDIVER_COMMIT_CONCURRENCY", "1"))
+        # Shared by every commit on this client, so concurrent research commits
+        # (e.g. --commit-to-graph over several episodes) stay within the cap together
+        self._commit_semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._index_lock = asyncio.Lock()  # Build indexes once even with concurrent commits
+        # Opt-in: add_episode_bulk amortizes dedup/edge resolution across episodes but
+        # skips edge invalidation, so per-episode commits stay the default
+        self._bulk_commit = os.environ.get("HELLDIVER_BULK_COMMIT") == "1"
+        self._dedup = os.environ.get("HELLDIVER_EPISODE_DEDUP", "0") == "1"
+        self._hash_db = None  # Opened on first commit (see _episode_hash_db)
 
         if not GRAPHITI_AVAILABLE:
             print("[WARN] Graphiti not available - running in mock mode")
@@ -191,7 +227,10 @@ class GraphClient:
             refinement_distilled: Distilled conversation context
 
         Returns:
-            Dict with status, episode_count, errors
+            Dict with status, episode_count, episodes, skipped (identical
+            content already committed), errors. status is "success" if any
+            episode was committed, "skipped" if every episode was a dedup
+            skip (nothing written), else "error".
 
         Commits:
             1. Episode 1: Academic Research
@@ -213,15 +252,15 @@ class GraphClient:
             }
 
         # Build indexes on first write (idempotent, safe to call multiple times)
-        if not self._indexes_built:
-            print("[INFO] Building Neo4j indexes...")
-            await self.graphiti.build_indices_and_constraints()
-            self._indexes_built = True
-            print("[OK] Indexes verified")
+        async with self._index_lock:
+            if not self._indexes_built:
+                print("[INFO] Building Neo4j indexes...")
+                await self.graphiti.build_indices_and_constraints()
+                self._indexes_built = True
+                print("[OK] Indexes verified")
 
         timestamp = datetime.now(timezone.utc)
-        episodes_committed = []
-        errors = []
+        episodes = []
 
         # Episodes 1-3: Worker findings
         worker_names = {
@@ -235,8 +274,6 @@ class GraphClient:
             if not content:
                 continue
 
-            ep_name = f"{episode_name} - {worker_label}"
-
             # Generate structured source_description with metadata
             source_desc = f"""[METADATA]
 Research Session: {session_name}
@@ -249,31 +286,17 @@ Timestamp: {timestamp.isoformat()}
 This episode contains {worker_label.lower()} findings for the research question: "{episode_name}".
 Part of the {session_name} research session using Helldiver's multi-agent research system."""
 
-            print(f"  [PROCESSING] {worker_label}... (extracting entities)")
-            try:
-                # Wrap in retry logic for rate limit handling
-                await retry_with_backoff(lambda: self.graphiti.add_episode(
-                    name=ep_name,
-                    episode_body=content,
-                    entity_types=ENTITY_TYPES,
-                    edge_types=EDGE_TYPES,
-                    edge_type_map=EDGE_TYPE_MAP,
-                    source_description=source_desc,
-                    reference_time=timestamp,
-                    group_id=group_id
-                ))
-                episodes_committed.append(ep_name)
-                print(f"[EPISODE] ✓ {ep_name}")
-
-            except Exception as e:
-                error_msg = f"Failed to commit {ep_name}: {str(e)}"
-                errors.append(error_msg)
-                print(f"[ERROR] {error_msg}")
+            episodes.append({
+                "name": f"{episode_name} - {worker_label}",
+                "label": worker_label,
+                "episode_body": content,
+                "source_description": source_desc,
+                "reference_time": timestamp,
+                "group_id": group_id
+            })
 
         # Episode 4: Critical Analysis
         if critical_analysis:
-            ep_name = f"{episode_name} - Critical Analysis"
-
             source_desc = f"""[METADATA]
 Research Session: {session_name}
 Episode: {episode_name}
@@ -285,31 +308,17 @@ Timestamp: {timestamp.isoformat()}
 This episode contains critical analysis synthesizing findings from academic research, industry intelligence, and tool analysis.
 Reviews evidence quality, identifies contradictions, filters noise, and highlights key insights."""
 
-            print(f"  [PROCESSING] Critical Analysis... (extracting entities)")
-            try:
-                # Wrap in retry logic for rate limit handling
-                await retry_with_backoff(lambda: self.graphiti.add_episode(
-                    name=ep_name,
-                    episode_body=critical_analysis,
-                    entity_types=ENTITY_TYPES,
-                    edge_types=EDGE_TYPES,
-                    edge_type_map=EDGE_TYPE_MAP,
-                    source_description=source_desc,
-                    reference_time=timestamp,
-                    group_id=group_id
-                ))
-                episodes_committed.append(ep_name)
-                print(f"[EPISODE] ✓ {ep_name}")
-
-            except Exception as e:
-                error_msg = f"Failed to commit {ep_name}: {str(e)}"
-                errors.append(error_msg)
-                print(f"[ERROR] {error_msg}")
+            episodes.append({
+                "name": f"{episode_name} - Critical Analysis",
+                "label": "Critical Analysis",
+                "episode_body": critical_analysis,
+                "source_description": source_desc,
+                "reference_time": timestamp,
+                "group_id": group_id
+            })
 
         # Episode 5: Refinement Context (THE GOLD - user's strategic framing)
         if refinement_distilled:
-            ep_name = f"{episode_name} - Refinement Context"
-
             source_desc = f"""[METADATA]
 Research Session: {session_name}
 Episode: {episode_name}
@@ -334,34 +343,199 @@ DISTILLED CONTEXT (The "Why" Behind This Research):
 This episode captures the user's mental models, key questions, and strategic framing
 that led to this research being executed."""
 
-            print(f"  [PROCESSING] Refinement Context (THE GOLD)... (extracting entities)")
-            try:
-                # Wrap in retry logic for rate limit handling
-                await retry_with_backoff(lambda: self.graphiti.add_episode(
-                    name=ep_name,
-                    episode_body=context_body,
-                    entity_types=ENTITY_TYPES,
-                    edge_types=EDGE_TYPES,
-                    edge_type_map=EDGE_TYPE_MAP,
-                    source_description=source_desc,
-                    reference_time=timestamp,
-                    group_id=group_id
-                ))
-                episodes_committed.append(ep_name)
-                print(f"[EPISODE] ✓ {ep_name} (THE GOLD)")
+            episodes.append({
+                "name": f"{episode_name} - Refinement Context",
+                "label": "Refinement Context (THE GOLD)",
+                "episode_body": context_body,
+                "source_description": source_desc,
+                "reference_time": timestamp,
+                "group_id": group_id
+            })
+
+        # Skip episodes whose exact content is already in the graph
+        episodes_skipped = []
+        if self._dedup:
+            fresh = []
+            for episode in episodes:
+                existing = self._committed_episode_name(episode)
+                if existing:
+                    episodes_skipped.append(episode["name"])
+                    print(f"[SKIP] {episode['name']} - identical content already committed as '{existing}'")
+                else:
+                    fresh.append(episode)
+            episodes = fresh
+
+        # One bulk ingestion if enabled, otherwise concurrent per-episode commits
+        results = await self.commit_episodes_bulk(episodes) if episodes else []
 
-            except Exception as e:
-                error_msg = f"Failed to commit {ep_name}: {str(e)}"
+        episodes_committed = []
+        errors = []
+        # Report in episode order (commits finish in arbitrary order)
+        for episode, result in zip(episodes, results):
+            if isinstance(result, Exception):
+                error_msg = f"Failed to commit {episode['name']}: {str(result)}"
                 errors.append(error_msg)
                 print(f"[ERROR] {error_msg}")
+            else:
+                episodes_committed.append(episode["name"])
+                print(f"[EPISODE] {OK_MARK} {episode['name']}")
+                if self._dedup:
+                    self._remember_episode(episode)
+
+        if episodes_committed:
+            status = "success"
+        elif episodes_skipped and not errors:
+            status = "skipped"  # Nothing written - not reported as a successful commit
+        else:
+            status = "error"
 
         return {
-            "status": "success" if episodes_committed else "error",
+            "status": status,
             "episode_count": len(episodes_committed),
             "episodes": episodes_committed,
+            "skipped": episodes_skipped,
             "errors": errors
         }
 
+    def _episode_hash_db(self) -> sqlite3.Connection:
+        """Open (once) the episode content-hash cache."""
+        if self._hash_db is None:
+            os.makedirs(os.path.dirname(EPISODE_HASH_DB), exist_ok=True)
+            self._hash_db = sqlite3.connect(EPISODE_HASH_DB)
+            self._hash_db.execute("CREATE TABLE IF NOT EXISTS seen (h TEXT PRIMARY KEY, episode_name TEXT)")
+        return self._hash_db
+
+    def _episode_hash(self, episode: Dict) -> str:
+        """Hash of where and what Graphiti extracts from (database + group + body), not the name."""
+        content = f"{self._uri}\0{episode['group_id']}\0{episode['episode_body']}"
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _committed_episode_name(self, episode: Dict) -> Optional[str]:
+        """Name of an earlier episode with identical content, or None."""
+        row = self._episode_hash_db().execute(
+            "SELECT episode_name FROM seen WHERE h = ?", (self._episode_hash(episode),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _remember_episode(self, episode: Dict):
+        """Record a successfully committed episode's content hash."""
+        with self._episode_hash_db() as db:  # Commits the transaction
+            db.execute(
+                "INSERT OR IGNORE INTO seen (h, episode_name) VALUES (?, ?)",
+                (self._episode_hash(episode), episode["name"])
+            )
+
+    async def commit_episodes_bulk(self, episodes: List[Dict]) -> List:
+        """
+        Commit episodes in a single Graphiti add_episode_bulk call.
+
+        Args:
+            episodes: Same dicts as commit_many (all sharing one group_id)
+
+        Returns:
+            Same shape as commit_many: episode name or exception, in input order
+
+        Why: One bulk call resolves entities/edges across all episodes at once
+        instead of once per episode, and writes in fewer Neo4j transactions.
+        Falls back to commit_many when bulk commits are disabled
+        (HELLDIVER_BULK_COMMIT != "1"), unsupported by the installed
+        graphiti_core, or the episodes span several group_ids.
+        """
+        group_ids = {episode["group_id"] for episode in episodes}
+        if not (self._bulk_commit and self._bulk_supported() and len(group_ids) == 1):
+            return await self.commit_many(episodes)
+
+        raw_episodes = [
+            RawEpisode(
+                name=episode["name"],
+                content=episode["episode_body"],
+                source_description=episode["source_description"],
+                source=EpisodeType.text,
+                reference_time=episode["reference_time"]
+            )
+            for episode in episodes
+        ]
+
+        print(f"  [PROCESSING] {len(episodes)} episodes in one bulk commit... (extracting entities)")
+
+        group_id = group_ids.pop()
+        try:
+            async with self._commit_semaphore:
+                await retry_with_backoff(lambda: self.graphiti.add_episode_bulk(
+                    raw_episodes,
+                    group_id=group_id,
+                    entity_types=ENTITY_TYPES,
+                    edge_types=EDGE_TYPES,
+                    edge_type_map=EDGE_TYPE_MAP
+                ))
+        except Exception as e:
+            # All-or-nothing: report the failure against every episode
+            return [e] * len(episodes)
+
+        return [episode["name"] for episode in episodes]
+
+    def _bulk_supported(self) -> bool:
+        """True if the installed graphiti_core bulk API accepts our custom ontology."""
+        if not BULK_AVAILABLE or not hasattr(self.graphiti, "add_episode_bulk"):
+            return False
+        params = inspect.signature(self.graphiti.add_episode_bulk).parameters
+        return all(name in params for name in ("entity_types", "edge_types", "edge_type_map"))
+
+    async def commit_many(self, episodes: List[Dict]) -> List:
+        """
+        Commit several episodes, bounded by the client-wide commit semaphore.
+
+        Args:
+            episodes: List of dicts with name, label, episode_body,
+                      source_description, reference_time, group_id
+
+        Returns:
+            One entry per episode, in input order: the episode name on
+            success, or the exception that made it fail
+
+        Why: Default path (see commit_episodes_bulk). With the default
+        HELLDIVER_COMMIT_CONCURRENCY=1 the semaphore runs episodes strictly in
+        input order, which is what Graphiti's entity resolution needs within a
+        group; higher values pipeline them (opt-in, risks duplicate entities).
+        Each episode gets full add_episode processing, including edge invalidation.
+        """
+        async def _one(episode: Dict):
+            async with self._commit_semaphore:
+                return await self._commit_episode(episode)
+
+        return await asyncio.gather(
+            *[_one(episode) for episode in episodes],
+            return_exceptions=True
+        )
+
+    async def _commit_episode(self, episode: Dict) -> str:
+        """
+        Commit a single episode with rate-limit retry.
+
+        Returns:
+            Episode name
+
+        Raises:
+            Exception from Graphiti if the commit fails after retries
+        """
+        ep_name = episode["name"]
+
+        print(f"  [PROCESSING] {episode['label']}... (extracting entities)")
+
+        # Wrap in retry logic for rate limit handling
+        await retry_with_backoff(lambda: self.graphiti.add_episode(
+            name=ep_name,
+            episode_body=episode["episode_body"],
+            entity_types=ENTITY_TYPES,
+            edge_types=EDGE_TYPES,
+            edge_type_map=EDGE_TYPE_MAP,
+            source_description=episode["source_description"],
+            reference_time=episode["reference_time"],
+            group_id=episode["group_id"]
+        ))
+
+        return ep_name
+
     def close(self):
         """
         Close Graphiti connection gracefully.
@@ -372,3 +546,17 @@ that led to this research being executed."""
         # graphiti.close() is async - can't call from sync method
         # Connection gets cleaned up on process exit
         pass
+
+
+@functools.lru_cache(maxsize=1)
+def get_graph_client() -> GraphClient:
+    """
+    Return the process-wide GraphClient.
+
+    Why: Each GraphClient() opens a new Neo4j driver and connection pool.
+    Sharing one instance means every commit reuses the same pool.
+
+    Note: The client is process-global. Call get_graph_client.cache_clear()
+    to force a fresh instance (e.g. for test isolation).
+    """
+    return GraphClient()
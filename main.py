@@ -16,8 +16,8 @@ Repeat steps 4-5 until user exits.
 import argparse
 import asyncio
 import os
+import re
 import sys
-from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -26,26 +26,38 @@ load_dotenv()
 # Add parent directory to path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.session import ResearchSession
+from core.session import ResearchSession, SAFE_NAME_TABLE, global_episode_name, remember_global_episode_name
 from core.research_cycle import run_research_cycle
-from graph.client import GraphClient
+from graph.client import get_graph_client
 import workers.research  # Import module to set TEST_MODE
-from utils.files import distill_conversation
+from utils.files import format_conversation_for_display, load_research_files
+from utils.llm import async_anthropic_client, response_text, tool_input, log_usage, set_usage_log, stream_message
 
 # Parse command line args
 parser = argparse.ArgumentParser(description='Helldiver Research Agent')
 parser.add_argument('--test', action='store_true', help='Test mode: fast research with Haiku')
 parser.add_argument('--refine', type=str, help='Resume existing session from directory')
 parser.add_argument('--commit-to-graph', type=str, help='Commit existing research files to graph (pass session directory)')
+parser.add_argument('--resume-research', type=str, help='Finish research interrupted mid-batch, then continue the session (pass session directory)')
 args = parser.parse_args()
 
 # Set test mode globally
 if args.test:
-    import workers.research
     workers.research.TEST_MODE = True
     print("[TEST MODE] Fast 30-second research (Haiku, 500 tokens, no web search)\n")
 
 
+async def ainput(prompt: str = "") -> str:
+    """
+    Non-blocking input(): reads stdin in a worker thread.
+
+    Why: Everything runs on one event loop (asyncio.run(main())). A plain
+    input() would freeze background tasks (e.g. session writes, in-flight
+    LLM calls) while the user is typing.
+    """
+    return await asyncio.to_thread(input, prompt)
+
+
 def print_header(text: str):
     """Print section header."""
     print("\n" + "="*80)
@@ -53,33 +65,108 @@ def print_header(text: str):
     print("="*80 + "\n")
 
 
-def generate_episode_name(query: str) -> str:
-    """
-    Generate a clean episode name for research using LLM.
+# Fast, cheap model for single-word classifier calls (YES/NO etc.)
+CLASSIFIER_MODEL = "claude-haiku-4-5"
 
-    COPIED FROM OLD CODE - uses LLM to convert query to clean episode name
+# Unambiguous yes/no replies are decided locally; anything else falls back to the LLM
+CONFIRM_NO_WORDS = {"no", "n", "nope", "nah", "don't", "dont", "stop", "cancel", "wait", "exit", "quit"}
+CONFIRM_YES_WORDS = {"yes", "y", "yeah", "yep", "yup", "sure", "ok", "okay", "go", "proceed", "start", "confirm"}
 
-    IMPORTANT: Episode names are used for:
-    1. Folder names in the file system
-    2. Episode titles in the knowledge graph
-    3. Future search and retrieval
 
-    Episode names should be:
-    - Concise (3-8 words)
-    - Descriptive of what was researched
-    - Keyword-focused (easy to find later)
-    - Professional (no verbose metadata)
-
-    Args:
-        query: The research query
+def quick_confirmation(reply: str):
+    """
+    Classify a yes/no reply without an API call.
 
     Returns:
-        Clean episode name (approved by user)
+        True/False for clear replies, None if ambiguous (caller asks the LLM)
+
+    Why: Most confirmations are "yes"/"go"/"no". Checking a word set first
+    skips a network round-trip on the common case. "No" words win so that
+    "no, don't start" is never read as a yes.
     """
-    from anthropic import Anthropic
-    anthropic_client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    words = set(re.findall(r"[a-z']+", reply.lower()))
+    if words & CONFIRM_NO_WORDS:
+        return False
+    if words & CONFIRM_YES_WORDS:
+        return True
+    return None
+
+
+# Whole-message commands whose intent is unambiguous - these skip the LLM
+# classification call. Only full matches count: "go" proceeds, but "go deeper
+# on pricing" still goes to the model. Bare affirmatives ("yes", "ready") are
+# left out: they usually answer the agent's own clarifying question.
+_INTENT_PATTERNS = {
+    "PROCEED": re.compile(r"(go|start|proceed|do it|let'?s (go|do it|start))[.! ]*", re.I),
+    "EXIT": re.compile(r"(exit|quit|bye|goodbye|done|end|stop)[.! ]*", re.I),
+}
+
+
+def quick_intent(user_input: str, intent: str) -> bool:
+    """True if the whole message is a bare command for this intent (see _INTENT_PATTERNS)."""
+    return _INTENT_PATTERNS[intent].fullmatch(user_input.strip()) is not None
+
 
-    prompt = f"""Generate a clean episode name for this research query.
+# Refinement answers longer than this (~500 tokens) are re-sent as a short digest
+DIGEST_THRESHOLD_CHARS = 2000
+
+# Refinement system prompt (static - research episodes are appended as separate blocks)
+REFINEMENT_SYSTEM_PROMPT = """You are helping the user explore research findings.
+
+The research findings (excerpts) for each research episode in this session follow, oldest first.
+
+Help the user understand the findings, explore specific aspects, and identify what's worth deep-diving on.
+
+Context: We're in refinement phase after completing research. For every user message:
+- If the user wants to end the session, call the classify_turn tool with intent EXIT
+- If the user wants to spawn deep research on one or more topics, call the classify_turn tool with intent DEEP_RESEARCH (set topics to ONLY the topics, 2-10 words each, be specific; list every topic if they ask for several, e.g. "all of those")
+- Otherwise they're asking about the research - answer directly in plain text (don't call the tool)
+
+Keep answers focused (roughly 400 words at most). If there's more to say, end with a short note that the user can type "more" to continue."""
+
+# Output budget for a refinement turn (answers are asked to stay short; "more" continues)
+REFINEMENT_MAX_TOKENS = 700
+
+# Sent to the model in place of a bare "more" (the session log keeps what the user typed)
+CONTINUE_PROMPT = "Continue your previous answer from where it stopped."
+
+# Anthropic allows 4 cache breakpoints per request - spend them on the newest episodes
+# (older episodes are still covered as part of the cached prefix)
+MAX_CONTEXT_CACHE_BREAKPOINTS = 4
+
+# Structured turn classification (intent + payload in a single LLM call)
+TASKING_TURN_TOOL = {
+    "name": "tasking_turn",
+    "description": "Classify the user's latest message and respond to it.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "intent": {"type": "string", "enum": ["PROCEED", "CONTINUE"]},
+            "response": {"type": "string", "description": "Follow-up response to the user (empty if PROCEED)"}
+        },
+        "required": ["intent", "response"]
+    }
+}
+
+REFINEMENT_TURN_TOOL = {
+    "name": "classify_turn",
+    "description": "Signal that the user wants to end the session or start deep research. Not used for questions - answer those in plain text.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "intent": {"type": "string", "enum": ["EXIT", "DEEP_RESEARCH"]},
+            "topics": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Deep research topics (2-10 words each) if DEEP_RESEARCH - one per topic the user asked for"
+            }
+        },
+        "required": ["intent"]
+    }
+}
+
+
+EPISODE_NAME_PROMPT = """Generate a clean episode name for this research query.
 
 RESEARCH QUERY: {query}
 
@@ -102,19 +189,131 @@ Query: "I want to learn about lighthouse construction" → "Lighthouse construct
 
 Respond with ONLY the episode name, nothing else."""
 
-    response = anthropic_client.messages.create(
+
+async def generate_episode_names(queries: list, session: ResearchSession = None) -> list:
+    """
+    Generate clean episode names for one or more research queries using LLM.
+
+    COPIED FROM OLD CODE - uses LLM to convert query to clean episode name
+
+    IMPORTANT: Episode names are used for:
+    1. Folder names in the file system
+    2. Episode titles in the knowledge graph
+    3. Future search and retrieval
+
+    Episode names should be:
+    - Concise (3-8 words)
+    - Descriptive of what was researched
+    - Keyword-focused (easy to find later)
+    - Professional (no verbose metadata)
+
+    Args:
+        queries: The research queries
+        session: Current session (optional) - reuses names already approved in it
+
+    Returns:
+        Clean episode names (approved by user), same order as queries
+
+    Why batched: Suggestions are independent LLM calls, so they are fired
+    concurrently. Only the user approvals happen one at a time.
+    Why memoized: Re-requesting a topic already named in this session skips
+    the LLM round-trip and the approval prompt. Topics named in an earlier
+    session (global cache) skip the LLM round-trip only. Researching a name
+    again gets a numbered episode (see ResearchSession.next_episode_name).
+    """
+    final_names = [None] * len(queries)
+    pending = []  # (index, query) pairs that need a fresh suggestion
+
+    for i, query in enumerate(queries):
+        cached_name = session.cached_episode_name(query) if session else None
+        if cached_name:
+            print(f"[CACHED] Using previously approved episode name: '{cached_name}'")
+            final_names[i] = cached_name
+        else:
+            pending.append((i, query))
+
+    # Names approved in an earlier session skip the LLM (the user still approves)
+    suggestions = [None] * len(pending)
+    to_fetch = []
+    from_global = set()  # pending indexes whose suggestion is a cached approved name
+    for j, (_, query) in enumerate(pending):
+        previous = global_episode_name(query)
+        if previous:
+            print(f"[CACHED] Previously approved episode name: '{previous['approved']}'")
+            suggestions[j] = previous["approved"]
+            from_global.add(j)
+        else:
+            to_fetch.append(j)
+
+    # Reuse suggestions prefetched while the user was confirming (see prefetch_episode_names)
+    fetched = await asyncio.gather(*[
+        _name_prefetch.pop(pending[j][1], None) or suggest_episode_name(pending[j][1])
+        for j in to_fetch
+    ])
+    for j, suggested_name in zip(to_fetch, fetched):
+        suggestions[j] = suggested_name
+
+    for j, ((i, query), suggested_name) in enumerate(zip(pending, suggestions)):
+        final_names[i] = await approve_episode_name(suggested_name)
+        # Cache hits only update the approved name: "suggested" stays what the model proposed
+        remember_global_episode_name(query, None if j in from_global else suggested_name, final_names[i])
+        if session:
+            session.cache_episode_name(query, final_names[i])
+
+    return final_names
+
+
+async def suggest_episode_name(query: str) -> str:
+    """Ask the LLM for an episode name suggestion (no user approval)."""
+    response = await async_anthropic_client.messages.create(
         model="claude-sonnet-4-5",
         max_tokens=100,
         temperature=0.3,
-        messages=[{"role": "user", "content": prompt}]
+        messages=[{"role": "user", "content": EPISODE_NAME_PROMPT.format(query=query)}]
     )
+    log_usage("Episode name", response)
+    return response_text(response).strip()
+
+
+# Speculative episode name suggestions: {query: Task}
+_name_prefetch = {}
+
+
+def prefetch_episode_names(queries: list, session: ResearchSession = None):
+    """
+    Start episode name suggestions in the background.
+
+    Why: The deep research confirmation waits on the user. Naming is needed
+    right after a "yes", so it runs during that wait instead of after it.
+    Queries already named (this session or an earlier one) are skipped.
+    """
+    for query in queries:
+        if query in _name_prefetch or global_episode_name(query):
+            continue
+        if session and session.cached_episode_name(query):
+            continue
+        _name_prefetch[query] = asyncio.create_task(suggest_episode_name(query))
+
 
-    suggested_name = ""
-    for block in response.content:
-        if block.type == "text":
-            suggested_name = block.text.strip()
+def cancel_episode_name_prefetch():
+    """Drop speculative suggestions (e.g. deep research was declined)."""
+    for task in _name_prefetch.values():
+        task.cancel()
+    _name_prefetch.clear()
 
-    # Show to user and get approval
+
+async def generate_episode_name(query: str, session: ResearchSession = None) -> str:
+    """Generate a clean episode name for a single research query (see generate_episode_names)."""
+    return (await generate_episode_names([query], session))[0]
+
+
+async def approve_episode_name(suggested_name: str) -> str:
+    """
+    Show a suggested episode name and let the user approve or override it.
+
+    Returns:
+        Final episode name
+    """
     print(f"\n{'='*80}")
     print("EPISODE NAME GENERATION")
     print(f"{'='*80}")
@@ -125,7 +324,7 @@ Respond with ONLY the episode name, nothing else."""
     print("  - Future search and retrieval")
     print("\nYou can approve it or provide a different name.\n")
 
-    user_input = input("Episode name (press Enter to approve, or type a different name): ").strip()
+    user_input = (await ainput("Episode name (press Enter to approve, or type a different name): ")).strip()
 
     if user_input:
         final_name = user_input
@@ -137,22 +336,22 @@ Respond with ONLY the episode name, nothing else."""
     return final_name
 
 
-def tasking_conversation(query: str) -> dict:
+async def tasking_conversation(query: str) -> dict:
     """
     Tasking phase: Socratic questioning to understand what user wants.
     Agent is a mentor helping refine the research question.
 
     COPIED FROM OLD CODE - uses intent detection, not trigger phrases
 
+    Each turn is one structured call (tasking_turn tool) that returns both
+    the intent and the follow-up response.
+
     Returns:
         Dict with:
         - refined_query: What we're going to research
         - conversation_history: Full conversation
         - summary: Summary for context
     """
-    from anthropic import Anthropic
-    anthropic_client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
     print("\nI'm here to help you conduct deep research. Think of me as your research mentor.")
     print("I'll ask some questions to understand exactly what you're looking for.\n")
 
@@ -175,121 +374,108 @@ Your role:
 
 Format your response as a natural conversation. Ask your clarifying questions."""
 
-    response = anthropic_client.messages.create(
+    # Streamed: the questions appear as they're written
+    response = await stream_message(
         model="claude-sonnet-4-5",
         max_tokens=1000,
         temperature=0.7,
         messages=[{"role": "user", "content": clarifying_prompt}]
     )
+    print()
 
-    clarifying_questions = ""
-    for block in response.content:
-        if block.type == "text":
-            clarifying_questions = block.text
-
-    print(f"{clarifying_questions}\n")
+    log_usage("Tasking questions", response)
+    clarifying_questions = response_text(response)
 
     # Open-ended conversational loop - user decides when done
     conversation_history = [{"role": "assistant", "content": clarifying_questions}]
+    # Pre-formatted transcript for the final summary, extended one line per message
+    history_text = f"ASSISTANT: {clarifying_questions}"
 
-    while True:
-        user_input = input("You: ").strip()
-
-        if not user_input:
-            continue
-
-        # Use LLM to detect intent - don't keyword match!
-        intent_check = f"""User said: "{user_input}"
-
-Is the user indicating they're ready to proceed with research, or do they want to continue the conversation?
-
-Respond with ONLY ONE WORD:
-- "PROCEED" if they want to start research (e.g., "go", "let's do it", "start", "yes do it", etc.)
-- "CONTINUE" if they're still clarifying or asking questions"""
-
-        intent_response = anthropic_client.messages.create(
-            model="claude-sonnet-4-5",
-            max_tokens=10,
-            temperature=0,
-            messages=[{"role": "user", "content": intent_check}]
-        )
-
-        intent = ""
-        for block in intent_response.content:
-            if block.type == "text":
-                intent = block.text.strip().upper()
-
-        if "PROCEED" in intent:
-            # Capture the final user message before breaking
-            conversation_history.append({"role": "user", "content": user_input})
-            break
-
-        # Continue conversation
-        conversation_history.append({"role": "user", "content": user_input})
-
-        # Agent responds with more questions or acknowledgment
-        follow_up_prompt = f"""You are a research mentor in conversation with a user.
+    # Follow-up turns: fixed instructions + the conversation as messages
+    # (the API needs a user message first, so the original query opens it)
+    follow_up_system = f"""You are a research mentor in conversation with a user.
 
 Original query: "{query}"
 
-Conversation so far:
-{chr(10).join([f"{msg['role'].upper()}: {msg['content']}" for msg in conversation_history])}
-
-The user just said: "{user_input}"
+For each user message, decide: is the user indicating they're ready to proceed with research, or do they want to continue the conversation?
+- "PROCEED" if they want to start research (e.g., "go", "let's do it", "start", "yes do it", etc.)
+- "CONTINUE" if they're still clarifying or asking questions
 
-Your role:
+If continuing, your role:
 - If you need more clarity, ask follow-up questions
 - If you understand their direction, acknowledge and ask if they're ready to proceed
 - Be conversational and natural
 - Don't artificially limit the conversation
 
-Respond naturally to continue the conversation."""
+Call the tasking_turn tool with the intent and your natural response."""
+    opening_message = {"role": "user", "content": f'I want to research: "{query}"'}
+
+    while True:
+        user_input = (await ainput("You: ")).strip()
+
+        if not user_input:
+            continue
 
-        response = anthropic_client.messages.create(
+        # Record user turn (kept whether we proceed or continue)
+        conversation_history.append({"role": "user", "content": user_input})
+        history_text += f"\nUSER: {user_input}"
+
+        # Bare "go"/"let's do it" - no need to ask the model
+        if quick_intent(user_input, "PROCEED"):
+            break
+
+        # One structured call detects intent AND writes the follow-up - don't keyword match
+        # anything beyond the bare commands above!
+        # The history goes in as real messages (no re-stringified transcript per turn)
+        response = await async_anthropic_client.messages.create(
             model="claude-sonnet-4-5",
             max_tokens=800,
             temperature=0.7,
-            messages=[{"role": "user", "content": follow_up_prompt}]
+            system=follow_up_system,
+            tools=[TASKING_TURN_TOOL],
+            tool_choice={"type": "tool", "name": "tasking_turn"},
+            messages=[opening_message] + conversation_history
         )
 
-        agent_response = ""
-        for block in response.content:
-            if block.type == "text":
-                agent_response = block.text
+        log_usage("Tasking turn", response)
+        turn = tool_input(response, "tasking_turn")
+
+        if "PROCEED" in turn.get("intent", "").upper():
+            break
+
+        # Continue conversation
+        agent_response = turn.get("response", "")
 
         print(f"\n{agent_response}\n")
-        conversation_history.append({"role": "assistant", "content": agent_response})
+        if agent_response:  # The API rejects empty messages (back-to-back user turns are merged)
+            conversation_history.append({"role": "assistant", "content": agent_response})
+            history_text += f"\nASSISTANT: {agent_response}"
 
     # Confirm understanding
     print("\n[UNDERSTANDING] Let me confirm what I'll research...")
 
-    # Build conversation summary for confirmation
-    conversation_text = "\n".join([f"{msg['role'].upper()}: {msg['content']}" for msg in conversation_history])
-
     confirmation_prompt = f"""Based on this entire conversation:
 
-{conversation_text}
+{history_text}
 
 Summarize what you understand they want to research.
 Be specific about focus areas and what will be valuable for them."""
 
-    response = anthropic_client.messages.create(
+    print()
+    response = await stream_message(
         model="claude-sonnet-4-5",
         max_tokens=500,
         temperature=0.3,
         messages=[{"role": "user", "content": confirmation_prompt}]
     )
+    print()
 
-    summary = ""
-    for block in response.content:
-        if block.type == "text":
-            summary = block.text
-
-    print(f"\n{summary}\n")
+    log_usage("Tasking summary", response)
+    summary = response_text(response)
 
     # Wait for explicit confirmation
     print("Ready to start deep research? This will take 3-5 minutes.")
-    approval = input("Type 'go' to start: ").strip().lower()
+    approval = (await ainput("Type 'go' to start: ")).strip().lower()
 
     if approval not in ['go', 'yes', 'start', 'do it', 'research']:
         print("[CANCELLED] Research cancelled.")
@@ -303,77 +489,131 @@ Be specific about focus areas and what will be valuable for them."""
     }
 
 
-def refinement_conversation(session: ResearchSession):
+async def digest_assistant_turn(session: ResearchSession, message: dict, turn: dict):
+    """
+    Replace a long assistant answer in the refinement history with a short digest.
+
+    Only called for answers at least one exchange old (never the newest one).
+    Runs in the background (Haiku) while the user types their next message.
+    The history entry is only swapped once the digest is ready; on failure
+    the full answer is kept.
+
+    Args:
+        session: Current research session (digest is recorded on the turn)
+        message: conversation_history entry ({"role": "assistant", ...})
+        turn: Matching refinement turn from session.add_refinement_turn()
+    """
+    try:
+        response = await async_anthropic_client.messages.create(
+            model=CLASSIFIER_MODEL,
+            max_tokens=150,
+            temperature=0,
+            messages=[{"role": "user", "content": f"""Summarize this answer in under 100 tokens.
+Keep key facts, numbers, and named entities. Respond with ONLY the summary.
+
+{message["content"]}"""}]
+        )
+    except Exception as e:
+        print(f"[WARN] Could not digest long answer: {e}")
+        return
+
+    log_usage("Answer digest", response)
+    digest = response_text(response).strip()
+    if digest:
+        message["content"] = digest
+        session.set_assistant_digest(turn, digest)
+
+
+async def refinement_conversation(session: ResearchSession):
     """
     Refinement phase: Interactive conversation with research context loaded.
     User can ask questions, request deep research, or exit.
 
     SIMPLIFIED VERSION - uses intent detection from old code
 
+    Each turn is one structured call (classify_turn tool) that returns the
+    intent plus the deep research topics or the answer, whichever applies.
+    Long answers are digested in the background so re-sent history stays small.
+
     Args:
         session: Current research session
 
     Returns:
-        Deep research topic (str) or None if exiting
+        Deep research topics (list of str) or None if exiting
     """
-    from anthropic import Anthropic
-    anthropic_client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
     print_header("Refinement Phase")
     print("\nResearch complete! Ready to discuss findings.")
     print("\nYou can:")
     print("  - Ask questions about the research")
     print("  - Request deep research on a specific topic")
+    print("  - Type 'more' to continue the last answer")
     print("  - Type 'exit' to end session\n")
 
-    # Load research findings
-    research_findings = ""
-    research_dir = session.next_episode_dir(session.query)
-
-    # Try to load worker files for context
-    worker_files = ["academic_researcher.txt", "industry_intelligence.txt", "tool_analyzer.txt", "critical_analysis.txt"]
-    for worker_file in worker_files:
-        file_path = os.path.join(research_dir, worker_file)
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                research_findings += f"\n\n=== {worker_file} ===\n{f.read()[:2000]}"  # First 2000 chars
+    # Load research findings per episode (cached on the session, re-read only if files changed)
+    # One system block per episode, oldest first: a new deep research appends a block
+    # instead of changing the existing ones, so earlier blocks stay cached
+    episode_names = session.episode_names or [session.query]
+    # Episodes load concurrently (each is a directory scan + up to 4 file reads)
+    all_findings = await asyncio.gather(*(
+        asyncio.to_thread(session.load_research_findings, session.episode_dir(episode_name))
+        for episode_name in episode_names
+    ))
+    research_blocks = []
+    for i, (episode_name, findings) in enumerate(zip(episode_names, all_findings)):
+        block = {"type": "text", "text": f"<research_episode name=\"{episode_name}\">\n{findings[:8000]}\n</research_episode>"}
+        if i >= len(episode_names) - MAX_CONTEXT_CACHE_BREAKPOINTS:
+            block["cache_control"] = {"type": "ephemeral"}
+        research_blocks.append(block)
+
+    # Loop-invariant: built once, the same blocks are sent every turn
+    # Order: static instructions -> per-episode research (cached) -> current focus
+    system_blocks = (
+        [{"type": "text", "text": REFINEMENT_SYSTEM_PROMPT}]
+        + research_blocks
+        + [{"type": "text", "text": f"Current research focus: {session.query}"}]
+    )
 
     conversation_history = []
+    digest_tasks = set()  # Keep references so background digests aren't garbage collected
+    latest_answer = None  # (history entry, session turn) of the newest answer - never digested
 
     while True:
-        user_input = input("You: ").strip()
+        user_input = (await ainput("You: ")).strip()
 
         if not user_input:
             continue
 
-        # Use LLM to detect intent - NO KEYWORD MATCHING
-        intent_prompt = f"""User said: "{user_input}"
-
-Context: We're in refinement phase after completing research. The user can:
-1. Ask questions about the research
-2. Request deep research on a specific topic
-3. Exit the session
-
-What is the user's intent?
-
-Respond with ONE of these intents:
-- EXIT - wants to end session
-- DEEP_RESEARCH - wants to spawn deep research on a topic
-- QUESTION - wants to ask about the research
+        # Bare "exit"/"done" - skip the classification call
+        if quick_intent(user_input, "EXIT"):
+            print("\n[EXITING] Session complete.")
+            session.state = "COMPLETE"
+            session.save()
+            return None
 
-Respond with ONLY the intent word."""
+        # "more" continues the previous answer (still in full in the history)
+        # instead of starting a new one
+        if user_input.lower() in ("more", "continue") and conversation_history:
+            model_input = CONTINUE_PROMPT
+        else:
+            model_input = user_input
 
-        intent_response = anthropic_client.messages.create(
+        # One call handles every intent: EXIT/DEEP_RESEARCH come back as a
+        # classify_turn tool call, questions as plain text. The answer stays
+        # outside the tool input, so hitting max_tokens leaves a readable,
+        # continuable partial answer instead of broken tool JSON.
+        response = await async_anthropic_client.messages.create(
             model="claude-sonnet-4-5",
-            max_tokens=20,
-            temperature=0,
-            messages=[{"role": "user", "content": intent_prompt}]
+            max_tokens=REFINEMENT_MAX_TOKENS,
+            temperature=0.7,
+            system=system_blocks,
+            tools=[REFINEMENT_TURN_TOOL],
+            tool_choice={"type": "auto"},
+            messages=conversation_history + [{"role": "user", "content": model_input}]
         )
 
-        intent = ""
-        for block in intent_response.content:
-            if block.type == "text":
-                intent = block.text.strip().upper()
+        log_usage("Refinement turn", response)
+        turn = tool_input(response, "classify_turn")
+        intent = turn.get("intent", "").upper()
 
         # Handle intents
         if "EXIT" in intent:
@@ -387,32 +627,24 @@ Respond with ONLY the intent word."""
             # This captures "research option 1" or similar request
             session.add_refinement_turn(user_input, f"[Triggering deep research based on: {user_input}]")
 
-            # Extract topic using LLM
-            topic_extract = f"""User said: "{user_input}"
-
-They want deep research. What specific topic do they want researched?
-
-Extract ONLY the topic (2-10 words). Be specific."""
-
-            topic_response = anthropic_client.messages.create(
-                model="claude-sonnet-4-5",
-                max_tokens=100,
-                temperature=0,
-                messages=[{"role": "user", "content": topic_extract}]
-            )
+            topics = [topic.strip() for topic in turn.get("topics", []) if topic.strip()]
+            if not topics:
+                print("[CANCELLED] Could not identify a deep research topic.\n")
+                continue
 
-            topic = ""
-            for block in topic_response.content:
-                if block.type == "text":
-                    topic = block.text.strip()
+            print(f"\n[UNDERSTANDING] Deep research topic(s): {'; '.join(topics)}")
+            print(f"This will spawn 3 new specialist workers + critical analyst per topic (3-5 minutes each).")
 
-            print(f"\n[UNDERSTANDING] Deep research topic: {topic}")
-            print("This will spawn 3 new specialist workers + critical analyst (3-5 minutes).")
+            # Name the topics speculatively while the user decides
+            prefetch_episode_names(topics, session)
 
             # Confirm with intent detection
-            confirm_input = input("\nReady to proceed? ").strip()
+            confirm_input = (await ainput("\nReady to proceed? ")).strip()
+
+            confirmed = quick_confirmation(confirm_input)
 
-            confirm_check = f"""User said: "{confirm_input}"
+            if confirmed is None:
+                confirm_check = f"""User said: "{confirm_input}"
 
 Are they confirming to proceed?
 
@@ -420,58 +652,51 @@ Respond with ONLY:
 - YES if confirming
 - NO if declining"""
 
-            confirm_response = anthropic_client.messages.create(
-                model="claude-sonnet-4-5",
-                max_tokens=5,
-                temperature=0,
-                messages=[{"role": "user", "content": confirm_check}]
-            )
+                confirm_response = await async_anthropic_client.messages.create(
+                    model=CLASSIFIER_MODEL,
+                    max_tokens=5,
+                    temperature=0,
+                    messages=[{"role": "user", "content": confirm_check}]
+                )
 
-            confirmation = ""
-            for block in confirm_response.content:
-                if block.type == "text":
-                    confirmation = block.text.strip().upper()
+                log_usage("Deep research confirmation", confirm_response)
+                confirmed = "YES" in response_text(confirm_response).strip().upper()
 
-            if "YES" in confirmation:
-                # Don't save the "go" confirmation - just return topic
-                return topic
+            if confirmed:
+                # Don't save the "go" confirmation - just return topics
+                return topics
             else:
+                cancel_episode_name_prefetch()
                 print("[CANCELLED] Deep research cancelled.\n")
                 continue
 
-        # Regular question - answer from research context
-        conversation_history.append({"role": "user", "content": user_input})
-
-        # Answer using research findings as context
-        system_prompt = f"""You are helping the user explore research findings.
-
-Research query: {session.query}
-
-Research findings (excerpts):
-{research_findings[:8000]}
-
-Help the user understand the findings, explore specific aspects, and identify what's worth deep-diving on."""
-
-        response = anthropic_client.messages.create(
-            model="claude-sonnet-4-5",
-            max_tokens=2000,
-            temperature=0.7,
-            system=system_prompt,
-            messages=conversation_history
-        )
-
-        assistant_msg = ""
-        for block in response.content:
-            if block.type == "text":
-                assistant_msg += block.text
+        # Regular question - answer came back as plain text
+        assistant_msg = response_text(response).strip()
+        if not assistant_msg:
+            # No text block (tool_choice is auto): an empty assistant message
+            # would get the next request rejected, so leave history untouched
+            print("[ERROR] Got an empty answer - please ask again.\n")
+            continue
+        conversation_history.append({"role": "user", "content": model_input})
 
         print(f"\n{assistant_msg}\n")
-        conversation_history.append({"role": "assistant", "content": assistant_msg})
+        if response.stop_reason == "max_tokens":
+            print("[TRUNCATED] Answer hit the length limit - type 'more' to continue.\n")
+        assistant_entry = {"role": "assistant", "content": assistant_msg}
+        conversation_history.append(assistant_entry)
 
         # Record in session
-        session.add_refinement_turn(user_input, assistant_msg)
+        turn = session.add_refinement_turn(user_input, assistant_msg)
         session.save()
 
+        # Long answers are digested once they're an exchange old: the newest
+        # answer stays in full so follow-ups ("expand point 3", "more") see it
+        if latest_answer is not None and len(latest_answer[0]["content"]) > DIGEST_THRESHOLD_CHARS:
+            task = asyncio.create_task(digest_assistant_turn(session, *latest_answer))
+            digest_tasks.add(task)
+            task.add_done_callback(digest_tasks.discard)
+        latest_answer = (assistant_entry, turn)
+
 
 async def commit_existing_research_to_graph(session_dir: str):
     """
@@ -500,8 +725,10 @@ async def commit_existing_research_to_graph(session_dir: str):
         return
 
     # Find all research subdirectories (they contain the worker files)
-    research_dirs = [d for d in os.listdir(session_dir)
-                     if os.path.isdir(os.path.join(session_dir, d))]
+    # Single scandir pass: DirEntry caches the type, no extra stat per entry
+    with os.scandir(session_dir) as entries:
+        research_dirs = [entry.name for entry in entries
+                         if entry.is_dir(follow_symlinks=False)]
 
     if not research_dirs:
         print(f"[ERROR] No research subdirectories found in {session_dir}")
@@ -512,56 +739,37 @@ async def commit_existing_research_to_graph(session_dir: str):
         print(f"  {i}. {rd}")
 
     # Confirm with user
-    confirm = input("\nCommit all episodes to graph? (yes/no): ").strip().lower()
+    confirm = (await ainput("\nCommit all episodes to graph? (yes/no): ")).strip().lower()
     if confirm not in ['yes', 'y']:
         print("[CANCELLED] Graph commit cancelled.")
         return
 
     # Initialize graph client
-    graph_client = GraphClient()
+    graph_client = get_graph_client()
 
-    # Process each research directory
-    for research_dirname in research_dirs:
+    async def commit_one(research_dirname: str):
+        """Load one research directory's files and commit them."""
         research_dir = os.path.join(session_dir, research_dirname)
 
         print(f"\n[PROCESSING] {research_dirname}")
 
-        # Load worker files
-        worker_results = {}
-        for worker_name in ['academic_researcher', 'industry_intelligence', 'tool_analyzer']:
-            worker_file = os.path.join(research_dir, f"{worker_name}.txt")
-            if os.path.exists(worker_file):
-                with open(worker_file, 'r', encoding='utf-8') as f:
-                    # Skip metadata header (first 4 lines)
-                    lines = f.readlines()
-                    content = ''.join(lines[4:]) if len(lines) > 4 else ''.join(lines)
-                    worker_results[worker_name] = content
-
-        # Load critical analysis
-        critical_file = os.path.join(research_dir, "critical_analysis.txt")
-        critical_analysis = ""
-        if os.path.exists(critical_file):
-            with open(critical_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                critical_analysis = ''.join(lines[2:]) if len(lines) > 2 else ''.join(lines)
-
-        # Load refinement context (if exists)
-        refinement_file = os.path.join(research_dir, "refinement_distilled.txt")
-        refinement_distilled = ""
-        if os.path.exists(refinement_file):
-            with open(refinement_file, 'r', encoding='utf-8') as f:
-                refinement_distilled = f.read()
+        # Load worker, critical and refinement files (read concurrently, headers stripped)
+        files = await asyncio.to_thread(load_research_files, research_dir)
+        worker_names = ['academic_researcher', 'industry_intelligence', 'tool_analyzer']
+        worker_results = {name: files[name] for name in worker_names if name in files}
+        critical_analysis = files.get("critical_analysis", "")
+        refinement_distilled = files.get("refinement_distilled", "")
 
         # Verify we have the minimum required files
         if not worker_results or not critical_analysis:
             print(f"  [SKIP] Missing worker files in {research_dirname}")
-            continue
+            return
 
         # Commit to graph (same logic as run_research_cycle)
         group_id = "helldiver_research"
         episode_name = research_dirname  # Use directory name as episode name
 
-        print(f"  [GRAPH] Committing to knowledge graph (group_id: {group_id})...")
+        print(f"  [GRAPH] Committing {research_dirname} to knowledge graph (group_id: {group_id})...")
         result = await graph_client.commit_research_episode(
             session_name=session.original_query,
             episode_name=episode_name,
@@ -572,27 +780,63 @@ async def commit_existing_research_to_graph(session_dir: str):
         )
 
         if result["status"] == "success":
-            print(f"  [SUCCESS] {result['episode_count']} episodes committed")
+            print(f"  [SUCCESS] {research_dirname}: {result['episode_count']} episodes committed")
+        elif result["status"] == "skipped":
+            print(f"  [SKIPPED] {research_dirname}: nothing committed - all episodes matched the dedup cache")
         else:
-            print(f"  [ERROR] Graph commit had errors: {result.get('errors', [])}")
+            print(f"  [ERROR] {research_dirname}: graph commit had errors: {result.get('errors', [])}")
+
+    # One directory at a time: every episode goes to the same group, and
+    # Graphiti's entity resolution needs sequential ingestion per group
+    for research_dirname in research_dirs:
+        await commit_one(research_dirname)
 
     # Cleanup
     graph_client.close()
     print(f"\n[COMPLETE] Graph commit complete for {session_dir}")
 
 
+async def resume_interrupted_research(session: ResearchSession, graph_client):
+    """
+    Re-run research cycles whose batch was left running by an interrupted process.
+
+    Each cycle reuses the stored query and tasking summary, so execute_research
+    finds the saved batch_state.json and polls that batch instead of paying
+    for a new one. Distillation, file saves and the graph commit then run as usual.
+
+    Args:
+        session: Loaded session
+        graph_client: Graph connection
+    """
+    interrupted = workers.research.find_interrupted_research(session.session_dir)
+    if not interrupted:
+        print("[INFO] No interrupted research found in this session\n")
+        return
+
+    for state in interrupted:
+        print_header(f"Resuming Research: {state['query']}")
+        await run_research_cycle(
+            session=session,
+            graph_client=graph_client,
+            query=state["query"],
+            tasking_summary=state["tasking_summary"]
+        )
+        print(f"\n[COMPLETE] Research finished! Ready to discuss findings.\n")
+
+
 async def main():
     """Main entry point."""
     print_header("Welcome to Helldiver Research Agent")
 
     # Initialize graph client
-    graph_client = GraphClient()
+    graph_client = get_graph_client()
 
     # Load or create session
-    if args.refine:
+    if args.refine or args.resume_research:
         # Resume existing session
         try:
-            session = ResearchSession.load(args.refine)
+            session = ResearchSession.load(args.refine or args.resume_research)
+            set_usage_log(session.session_dir)
             print(f"[LOADED] Resumed session: {session.original_query}")
             print(f"[STATE] Episodes completed: {session.episode_count}\n")
 
@@ -600,36 +844,40 @@ async def main():
             print(f"[ERROR] Could not load session: {e}")
             return
 
+        if args.resume_research:
+            await resume_interrupted_research(session, graph_client)
+
     else:
         # Start new session
-        query = input("What would you like to research? ").strip()
+        query = (await ainput("What would you like to research? ")).strip()
 
         if not query:
             print("[ERROR] No query provided")
             return
 
         # Tasking conversation
-        tasking_result = tasking_conversation(query)
+        tasking_result = await tasking_conversation(query)
         refined_query = tasking_result["refined_query"]
         tasking_summary = tasking_result["summary"]
 
         # Generate clean episode name using LLM (FROM OLD CODE)
-        episode_name = generate_episode_name(refined_query)
+        episode_name = await generate_episode_name(refined_query)
 
         # Create session directory using clean episode name
         # Just replace spaces and slashes - KEEP IT SIMPLE
-        session_name = episode_name.replace(" ", "_").replace("/", "_")
+        session_name = episode_name.translate(SAFE_NAME_TABLE)
         # Limit to 80 chars for safety
         if len(session_name) > 80:
             session_name = session_name[:80]
         session_dir = os.path.join("context", session_name)
-        os.makedirs(session_dir, exist_ok=True)
 
         session = ResearchSession(
             session_dir=session_dir,
             query=refined_query,
             state="RESEARCH"
         )
+        session.ensure_dir(session_dir)
+        set_usage_log(session_dir)
         session.tasking_context = tasking_result
         session.save()
 
@@ -646,31 +894,34 @@ async def main():
 
     # Refinement loop (ask questions, trigger deep research, or exit)
     while True:
-        deep_topic = refinement_conversation(session)
+        deep_topics = await refinement_conversation(session)
 
-        if not deep_topic:
+        if not deep_topics:
             # User exited
             break
 
-        # Generate clean episode name for deep research (FROM OLD CODE)
-        episode_name = generate_episode_name(deep_topic)
-
-        # Execute deep research
-        print_header(f"Executing Deep Research: {episode_name}")
+        # Generate clean episode names for deep research (FROM OLD CODE)
+        episode_names = await generate_episode_names(deep_topics, session)
 
-        # Create summary of refinement context
-        from utils.files import convert_tasking_to_conversation, format_conversation_for_display
-        refinement_text = format_conversation_for_display(session.pending_refinement)
+        # Create summary of refinement context (shared by all topics requested together).
+        # Snapshot the conversation: the first cycle clears pending_refinement
+        refinement_snapshot = list(session.pending_refinement)
+        refinement_text = format_conversation_for_display(refinement_snapshot)
         tasking_summary = f"Context from refinement conversation:\n{refinement_text[:500]}..."
 
-        result = await run_research_cycle(
-            session=session,
-            graph_client=graph_client,
-            query=episode_name,  # Use clean episode name
-            tasking_summary=tasking_summary
-        )
+        for episode_name in episode_names:
+            # Execute deep research
+            print_header(f"Executing Deep Research: {episode_name}")
 
-        print(f"\n[COMPLETE] Research finished! Ready to discuss findings.\n")
+            result = await run_research_cycle(
+                session=session,
+                graph_client=graph_client,
+                query=episode_name,  # Use clean episode name
+                tasking_summary=tasking_summary,
+                refinement_conversation=refinement_snapshot
+            )
+
+            print(f"\n[COMPLETE] Research finished! Ready to discuss findings.\n")
 
     # Cleanup
     graph_client.close()
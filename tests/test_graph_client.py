@@ -0,0 +1,62 @@
+"""
+Episode content-hash dedup in graph/client.py (HELLDIVER_EPISODE_DEDUP=1).
+
+Run: python -m unittest discover tests
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from graph import client as graph_client
+except ImportError as e:
+    raise unittest.SkipTest(f"graph.client dependencies not installed: {e}")
+
+
+def _episode(body, name="Topic - Academic Research", group_id="helldiver_research"):
+    return {"name": name, "episode_body": body, "group_id": group_id}
+
+
+class EpisodeDedupTest(unittest.TestCase):
+    """Committed episode bodies are remembered per database and group, not per name."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        patcher = mock.patch.object(graph_client, "EPISODE_HASH_DB", os.path.join(self.cache_dir, "hashes.sqlite"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = self._client("bolt://db-a:7687")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _client(self, uri):
+        with mock.patch.object(graph_client, "GRAPHITI_AVAILABLE", False), \
+                mock.patch.dict(os.environ, {"NEO4J_URI": uri, "HELLDIVER_EPISODE_DEDUP": "1"}):
+            client = graph_client.GraphClient()
+        self.addCleanup(lambda: client._hash_db and client._hash_db.close())
+        return client
+
+    def test_remembered_body_is_found_under_any_name(self):
+        self.assertIsNone(self.client._committed_episode_name(_episode("body")))
+
+        self.client._remember_episode(_episode("body"))
+
+        renamed = _episode("body", name="Other topic - Academic Research")
+        self.assertEqual(self.client._committed_episode_name(renamed), "Topic - Academic Research")
+
+    def test_other_body_or_group_is_not_a_duplicate(self):
+        self.client._remember_episode(_episode("body"))
+        self.assertIsNone(self.client._committed_episode_name(_episode("other body")))
+        self.assertIsNone(self.client._committed_episode_name(_episode("body", group_id="other_group")))
+
+    def test_other_database_is_not_a_duplicate(self):
+        self.client._remember_episode(_episode("body"))
+        self.assertIsNone(self._client("bolt://db-b:7687")._committed_episode_name(_episode("body")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Local (no API call) intent shortcuts in main.py.
+
+Run: python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from unittest import mock
+
+try:
+    with mock.patch.object(sys, "argv", ["main.py"]):  # main parses CLI args on import
+        import main
+except ImportError as e:
+    raise unittest.SkipTest(f"main.py dependencies not installed: {e}")
+
+
+class QuickConfirmationTest(unittest.TestCase):
+    """Clear yes/no replies are decided locally; anything else goes to the LLM."""
+
+    def test_yes_replies(self):
+        for reply in ["yes", "Y", "ok go", "Sure!", "yep, start it"]:
+            self.assertIs(main.quick_confirmation(reply), True, reply)
+
+    def test_no_replies(self):
+        for reply in ["no", "Nope", "cancel", "wait"]:
+            self.assertIs(main.quick_confirmation(reply), False, reply)
+
+    def test_no_wins_over_yes(self):
+        self.assertIs(main.quick_confirmation("no, don't start"), False)
+
+    def test_ambiguous_reply_falls_back(self):
+        self.assertIsNone(main.quick_confirmation("maybe add pricing first"))
+
+
+class QuickIntentTest(unittest.TestCase):
+    """Only whole-message commands skip the classification call."""
+
+    def test_bare_proceed_commands(self):
+        for reply in ["go", "Go!", "start", "proceed.", "do it", "let's go", "lets start"]:
+            self.assertTrue(main.quick_intent(reply, "PROCEED"), reply)
+
+    def test_bare_affirmatives_are_not_proceed(self):
+        for reply in ["yes", "ok", "ready", "sure"]:
+            self.assertFalse(main.quick_intent(reply, "PROCEED"), reply)
+
+    def test_commands_inside_a_sentence_go_to_the_model(self):
+        self.assertFalse(main.quick_intent("go deeper on pricing", "PROCEED"))
+        self.assertFalse(main.quick_intent("done with pricing, now tools?", "EXIT"))
+
+    def test_bare_exit_commands(self):
+        for reply in ["exit", "quit", "bye", "Done."]:
+            self.assertTrue(main.quick_intent(reply, "EXIT"), reply)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Batch resume state and critical-analyst triage in workers/research.py.
+
+Run: python -m unittest discover tests
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+try:
+    from workers import research
+except ImportError as e:
+    raise unittest.SkipTest(f"workers.research dependencies not installed: {e}")
+
+
+class BatchStateTest(unittest.TestCase):
+    """batch_state.json lets an interrupted run pick up its batch again."""
+
+    def setUp(self):
+        self.session_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+
+    def _research_dir(self, name):
+        path = os.path.join(self.session_dir, name)
+        os.makedirs(path)
+        return path
+
+    def test_state_matches_on_query_only(self):
+        research_dir = self._research_dir("Topic")
+        research._save_batch_state(research_dir, "batch_1", "Topic", "first tasking summary")
+
+        # A rerun regenerates the tasking summary - the stored one is what the batch used
+        state = research._pending_batch_state(research_dir, "Topic")
+        self.assertEqual(state["batch_id"], "batch_1")
+        self.assertEqual(state["tasking_summary"], "first tasking summary")
+        self.assertIsNone(research._pending_batch_state(research_dir, "Other topic"))
+
+    def test_cleared_or_corrupt_state_is_ignored(self):
+        research_dir = self._research_dir("Topic")
+        research._save_batch_state(research_dir, "batch_1", "Topic", "")
+        research._clear_batch_state(research_dir)
+        self.assertIsNone(research._pending_batch_state(research_dir, "Topic"))
+
+        with open(os.path.join(research_dir, research.BATCH_STATE_FILE), 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        self.assertIsNone(research._pending_batch_state(research_dir, "Topic"))
+
+    def test_find_interrupted_research_oldest_first(self):
+        for name, started_at in [("B", "2026-01-02T00:00:00"), ("A", "2026-01-01T00:00:00")]:
+            with open(os.path.join(self._research_dir(name), research.BATCH_STATE_FILE), 'w', encoding='utf-8') as f:
+                json.dump({"batch_id": f"batch_{name}", "query": name, "started_at": started_at}, f)
+        self._research_dir("Finished")  # No state file: not interrupted
+
+        states = research.find_interrupted_research(self.session_dir)
+        self.assertEqual([state["query"] for state in states], ["A", "B"])
+
+
+class TriageTest(unittest.TestCase):
+    """Haiku's review is kept only if every worker scores >= TRIAGE_MIN_SCORE."""
+
+    def _triage(self, analysis):
+        response = SimpleNamespace(content=[SimpleNamespace(type="text", text=analysis)])
+        with mock.patch.object(research, "anthropic_client") as client:
+            client.messages.create.return_value = response
+            return research._triage_critical_analysis("findings")
+
+    def test_high_scores_keep_haiku_review(self):
+        analysis = "## Relevance Scores\nAcademic: 8/10\nIndustry: 9/10\nTool: 7/10\n\n## Gaps\nNone"
+        self.assertEqual(self._triage(analysis), analysis)
+
+    def test_low_score_escalates(self):
+        analysis = "## Relevance Scores\nAcademic: 8/10\nIndustry: 5/10\nTool: 9/10\n"
+        self.assertIsNone(self._triage(analysis))
+
+    def test_scores_outside_the_section_are_ignored(self):
+        analysis = "## Summary\nOne source rated it 9/10.\n\n## Relevance Scores\nAcademic: 8/10\nIndustry: 9/10\n"
+        self.assertIsNone(self._triage(analysis))  # Only two scores in the section
+
+    def test_missing_section_escalates(self):
+        self.assertIsNone(self._triage("Academic: 9/10\nIndustry: 9/10\nTool: 9/10"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+Session persistence tests.
+
+Run: python -m unittest discover tests
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.session import ResearchSession, REFINEMENT_LOG_FILE
+
+
+class LegacyRefinementMigrationTest(unittest.TestCase):
+    """Sessions saved before refinement_pending.jsonl existed keep their turns."""
+
+    def setUp(self):
+        self.session_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+
+    def _write_legacy_session(self, turns):
+        with open(os.path.join(self.session_dir, "session.json"), 'w', encoding='utf-8') as f:
+            json.dump({
+                "query": "q",
+                "original_query": "q",
+                "state": "REFINEMENT",
+                "episode_count": 1,
+                "pending_refinement": turns,
+            }, f)
+
+    def test_legacy_turns_survive_new_turn_and_reload(self):
+        self._write_legacy_session([
+            {"user_input": "old1", "assistant_response": "a1", "timestamp": ""}
+        ])
+
+        session = ResearchSession.load(self.session_dir)
+        self.assertEqual([t["user_input"] for t in session.pending_refinement], ["old1"])
+
+        session.add_refinement_turn("new1", "a2")
+        session.save()
+        ResearchSession.flush()
+
+        self.assertTrue(os.path.exists(os.path.join(self.session_dir, REFINEMENT_LOG_FILE)))
+        reloaded = ResearchSession.load(self.session_dir)
+        self.assertEqual([t["user_input"] for t in reloaded.pending_refinement], ["old1", "new1"])
+
+    def test_no_log_created_without_legacy_turns(self):
+        self._write_legacy_session([])
+
+        ResearchSession.load(self.session_dir)
+        ResearchSession.flush()
+
+        self.assertFalse(os.path.exists(os.path.join(self.session_dir, REFINEMENT_LOG_FILE)))
+
+
+class SaveTrackingTest(unittest.TestCase):
+    """save() only writes when a persisted field changed; batched_save() writes once."""
+
+    def setUp(self):
+        self.session_dir = tempfile.mkdtemp()
+        self.session_file = os.path.join(self.session_dir, "session.json")
+        self.session = ResearchSession(self.session_dir, "q")
+
+    def tearDown(self):
+        ResearchSession.flush()
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+
+    def _saved(self):
+        ResearchSession.flush()
+        with open(self.session_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_new_session_is_saved(self):
+        self.session.save()
+        self.assertEqual(self._saved()["query"], "q")
+
+    def test_unchanged_session_is_not_rewritten(self):
+        self.session.save()
+        ResearchSession.flush()
+        os.remove(self.session_file)
+
+        self.session.state = self.session.state  # Same value: still clean
+        self.session.save()
+        ResearchSession.flush()
+
+        self.assertFalse(os.path.exists(self.session_file))
+
+    def test_changed_field_is_saved(self):
+        self.session.save()
+        self.session.state = "REFINEMENT"
+        self.session.save()
+        self.assertEqual(self._saved()["state"], "REFINEMENT")
+
+    def test_batched_save_defers_until_outermost_exit(self):
+        with self.session.batched_save():
+            self.session.state = "RESEARCH"
+            with self.session.batched_save():
+                self.session.episode_count += 1
+            self.session.save()
+            ResearchSession.flush()
+            self.assertFalse(os.path.exists(self.session_file))
+
+        saved = self._saved()
+        self.assertEqual((saved["state"], saved["episode_count"]), ("RESEARCH", 1))
+
+
+class RefinementLogTest(unittest.TestCase):
+    """Refinement turns are appended in order and truncated by clear_refinement()."""
+
+    def setUp(self):
+        self.session_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.session_dir, REFINEMENT_LOG_FILE)
+        self.session = ResearchSession(self.session_dir, "q")
+
+    def tearDown(self):
+        ResearchSession.flush()
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+
+    def _logged_inputs(self):
+        ResearchSession.flush()
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            return [json.loads(line)["user_input"] for line in f if line.strip()]
+
+    def test_turns_are_appended_in_order(self):
+        for i in range(5):
+            self.session.add_refinement_turn(f"u{i}", f"a{i}")
+        self.assertEqual(self._logged_inputs(), [f"u{i}" for i in range(5)])
+
+    def test_clear_refinement_truncates_log(self):
+        self.session.add_refinement_turn("u", "a")
+        self.session.clear_refinement()
+        self.session.add_refinement_turn("after", "a")
+
+        self.assertEqual(self.session.pending_refinement[0]["user_input"], "after")
+        self.assertEqual(self._logged_inputs(), ["after"])
+
+
+class NextEpisodeNameTest(unittest.TestCase):
+    """Re-researching a topic never reuses a finished episode's folder."""
+
+    def setUp(self):
+        self.session_dir = tempfile.mkdtemp()
+        self.session = ResearchSession(self.session_dir, "q")
+
+    def tearDown(self):
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+
+    def _touch(self, episode_name, filename):
+        path = self.session.episode_dir(episode_name)
+        os.makedirs(path, exist_ok=True)
+        open(os.path.join(path, filename), 'w').close()
+
+    def test_new_topic_keeps_its_name(self):
+        self.assertEqual(self.session.next_episode_name("Graph DBs"), "Graph DBs")
+
+    def test_finished_topic_gets_numbered(self):
+        self._touch("Graph DBs", "critical_analysis.txt")
+        self._touch("Graph DBs 2", "tool_analyzer.txt")
+        self.assertEqual(self.session.next_episode_name("Graph DBs"), "Graph DBs 3")
+        self.assertTrue(self.session.episode_dir("Graph DBs 3").endswith("Graph_DBs_3"))
+
+    def test_pending_batch_folder_is_reused(self):
+        self._touch("Graph DBs", "academic_researcher.txt")
+        self._touch("Graph DBs", "batch_state.json")
+        self.assertEqual(self.session.next_episode_name("Graph DBs"), "Graph DBs")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,4 +5,5 @@ Helper functions that don't fit elsewhere:
 - File I/O (save research files, distillation)
 - Prompt templates
 - Formatting helpers
+- Anthropic client, response, prompt-cache and token-usage helpers (llm.py)
 """
@@ -12,16 +12,39 @@ Plus narrative.txt (synthesized summary) and refinement_context.txt (full conver
 """
 
 import os
-from typing import Dict, List, Optional
-from anthropic import Anthropic
-from dotenv import load_dotenv
-from workers.prompts import REFINEMENT_DISTILLATION_PROMPT
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Initialize Anthropic client for distillation
-anthropic_client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+from workers.prompts import REFINEMENT_DISTILLATION_STATIC, REFINEMENT_DISTILLATION_INPUT_TEMPLATE
+from utils.llm import anthropic_client, log_usage
+
+# Separator lines and static file banners (built once, not per save)
+SEPARATOR_LINE = "=" * 80
+DASH_LINE = "-" * 80
+
+# (user_input, assistant_response) accessor for conversation turns
+TURN_FIELDS = operator.itemgetter('user_input', 'assistant_response')
+
+REFINEMENT_CONTEXT_BANNER = (
+    "REFINEMENT CONTEXT - Full Conversation (Audit Trail)\n"
+    f"{SEPARATOR_LINE}\n"
+    "This is the full conversation that led to this research being executed.\n"
+    "For the distilled version (what goes to graph), see refinement_distilled.txt\n"
+    f"{SEPARATOR_LINE}\n\n"
+)
+
+REFINEMENT_DISTILLED_BANNER = (
+    "REFINEMENT CONTEXT - Distilled (Committed to Graph)\n"
+    f"{SEPARATOR_LINE}\n"
+    "This is the extracted gold/signal from the conversation.\n"
+    "This version is committed to the knowledge graph as Episode 5.\n"
+    "WEIGHTING: This context is weighted HIGHER than raw research findings.\n"
+    f"{SEPARATOR_LINE}\n\n"
+)
+
+# Banners pre-encoded once so each save only encodes the variable body
+REFINEMENT_CONTEXT_BANNER_BYTES = REFINEMENT_CONTEXT_BANNER.encode('utf-8')
+REFINEMENT_DISTILLED_BANNER_BYTES = REFINEMENT_DISTILLED_BANNER.encode('utf-8')
 
 
 def save_research_files(
@@ -53,35 +76,104 @@ def save_research_files(
     """
     os.makedirs(research_dir, exist_ok=True)
 
-    # Save 3 worker outputs
-    for worker_name, content in worker_results.items():
-        filename = f"{worker_name}.txt"
-        filepath = os.path.join(research_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-    # Save critical analysis
-    with open(os.path.join(research_dir, "critical_analysis.txt"), 'w', encoding='utf-8') as f:
-        f.write(critical_analysis)
-
-    # Save full refinement context (audit trail)
-    with open(os.path.join(research_dir, "refinement_context.txt"), 'w', encoding='utf-8') as f:
-        f.write("REFINEMENT CONTEXT - Full Conversation (Audit Trail)\n")
-        f.write("="*80 + "\n")
-        f.write("This is the full conversation that led to this research being executed.\n")
-        f.write("For the distilled version (what goes to graph), see refinement_distilled.txt\n")
-        f.write("="*80 + "\n\n")
-        f.write(refinement_full)
-
-    # Save distilled refinement (what goes to graph as Episode 5)
-    with open(os.path.join(research_dir, "refinement_distilled.txt"), 'w', encoding='utf-8') as f:
-        f.write("REFINEMENT CONTEXT - Distilled (Committed to Graph)\n")
-        f.write("="*80 + "\n")
-        f.write("This is the extracted gold/signal from the conversation.\n")
-        f.write("This version is committed to the knowledge graph as Episode 5.\n")
-        f.write("WEIGHTING: This context is weighted HIGHER than raw research findings.\n")
-        f.write("="*80 + "\n\n")
-        f.write(refinement_distilled)
+    # 3 worker outputs + critical analysis + 2 refinement files: independent
+    # writes, so they're issued concurrently instead of one after another
+    files = [
+        (os.path.join(research_dir, f"{worker_name}.txt"), content)
+        for worker_name, content in worker_results.items()
+    ]
+    files.append((os.path.join(research_dir, "critical_analysis.txt"), critical_analysis))
+    files.extend(_refinement_files(research_dir, refinement_full, refinement_distilled))
+
+    _write_files(files)
+
+
+def save_refinement_files(research_dir: str, refinement_full: str, refinement_distilled: str):
+    """
+    Save the two refinement context files to episode directory.
+
+    Args:
+        research_dir: Path to episode folder
+        refinement_full: Full conversation transcript (audit trail)
+        refinement_distilled: Distilled context (what goes to graph)
+
+    Creates:
+        - refinement_context.txt (full conversation)
+        - refinement_distilled.txt (distilled for graph)
+    """
+    _write_files(_refinement_files(research_dir, refinement_full, refinement_distilled))
+
+
+def _refinement_files(research_dir: str, refinement_full: str, refinement_distilled: str) -> List[tuple]:
+    """Build (path, bytes) for both refinement files, banner and body joined (one write each)."""
+    return [
+        # Full refinement context (audit trail)
+        (os.path.join(research_dir, "refinement_context.txt"),
+         REFINEMENT_CONTEXT_BANNER_BYTES + refinement_full.encode('utf-8')),
+        # Distilled refinement (what goes to graph as Episode 5)
+        (os.path.join(research_dir, "refinement_distilled.txt"),
+         REFINEMENT_DISTILLED_BANNER_BYTES + refinement_distilled.encode('utf-8')),
+    ]
+
+
+# Raw fd flags for write_file (O_BINARY exists only on Windows: no newline translation)
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def write_file(filepath: str, content: Union[str, bytes]):
+    """
+    Write one UTF-8 text file with raw os.write calls.
+
+    content may be str or already-encoded UTF-8 bytes (skips the encode).
+
+    Why: Content is encoded once and handed to the OS directly, skipping the
+    TextIOWrapper/BufferedWriter layers that a single big write doesn't need.
+    Newlines are written as-is ("\n") on every platform.
+
+    Atomic: bytes go to a temp file that replaces the target only once fully
+    written, so a crash never leaves a truncated research file behind.
+    """
+    data = memoryview(content if isinstance(content, bytes) else content.encode('utf-8'))
+    tmp_path = filepath + ".tmp"
+    fd = os.open(tmp_path, WRITE_FLAGS, 0o644)
+    try:
+        while data:  # os.write may write less than asked
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, filepath)
+
+
+def _write_files(files: List[tuple]):
+    """
+    Write several (path, content) files concurrently.
+
+    Why: File writes release the GIL, so independent writes overlap their
+    disk latency. Errors from any write are re-raised here.
+    """
+    with ThreadPoolExecutor(max_workers=len(files) or 1) as pool:
+        futures = [pool.submit(write_file, path, content) for path, content in files]
+        for future in futures:
+            future.result()
+
+
+TURN_TEMPLATE = "--- Turn {i} ---\nUSER: {user}\n\nASSISTANT: {assistant}\n\n" + DASH_LINE + "\n"
+
+
+def iter_conversation_chunks(conversation: List[Dict]):
+    """
+    Yield the display transcript one turn at a time.
+
+    Why: Callers can write turns straight to a file, or join once, without
+    building the intermediate per-line list the old formatter needed.
+    """
+    for i, turn in enumerate(conversation, 1):
+        chunk = TURN_TEMPLATE.format(
+            i=i,
+            user=turn.get('user_input', ''),
+            assistant=turn.get('assistant_response', '')
+        )
+        yield chunk if i == 1 else "\n" + chunk
 
 
 def format_conversation_for_display(conversation: List[Dict]) -> str:
@@ -97,13 +189,7 @@ def format_conversation_for_display(conversation: List[Dict]) -> str:
     Why: Full conversation transcript is saved for debugging/audit.
     The distilled version goes to graph, but we keep original for reference.
     """
-    output = []
-    for i, turn in enumerate(conversation, 1):
-        output.append(f"--- Turn {i} ---")
-        output.append(f"USER: {turn.get('user_input', '')}")
-        output.append(f"\nASSISTANT: {turn.get('assistant_response', '')}")
-        output.append("\n" + "-"*80 + "\n")
-    return "\n".join(output)
+    return "".join(iter_conversation_chunks(conversation))
 
 
 def convert_tasking_to_conversation(tasking_context: Dict) -> List[Dict]:
@@ -125,24 +211,24 @@ def convert_tasking_to_conversation(tasking_context: Dict) -> List[Dict]:
     """
     conversation_history = tasking_context.get("conversation_history", [])
     turns = []
-    pending_assistant = None
+    append = turns.append  # bound once, not looked up per message
+    pending_assistant = ""
 
     for msg in conversation_history:
         role = msg.get("role", "")
-        content = msg.get("content", "")
 
         if role == "assistant":
             # Store assistant message, pair with next user message
-            pending_assistant = content
+            pending_assistant = msg.get("content", "") or ""
 
         elif role == "user":
             # Create turn: user message + any pending assistant message
-            turns.append({
-                "user_input": content,
-                "assistant_response": pending_assistant or "",
+            append({
+                "user_input": msg.get("content", ""),
+                "assistant_response": pending_assistant,
                 "timestamp": msg.get("timestamp", "")
             })
-            pending_assistant = None
+            pending_assistant = ""
 
     return turns
 
@@ -175,35 +261,73 @@ def distill_conversation(conversation: List[Dict]) -> str:
         return "(No refinement conversation - research triggered immediately)"
 
     # Format conversation for distillation
-    conversation_text = "\n\n".join([
-        f"USER: {turn['user_input']}\n\nASSISTANT: {turn['assistant_response']}"
-        for turn in conversation
-    ])
+    # itemgetter pulls both fields in one C call; generator avoids a temp list
+    conversation_text = "\n\n".join(
+        f"USER: {user}\n\nASSISTANT: {assistant}"
+        for user, assistant in map(TURN_FIELDS, conversation)
+    )
 
     # Use elite optimized distillation prompt (XML tags, examples, clear extraction rules)
-    distillation_prompt = REFINEMENT_DISTILLATION_PROMPT.format(
+    # Static rules first (cached across research cycles), conversation last
+    distillation_input = REFINEMENT_DISTILLATION_INPUT_TEMPLATE.format(
         conversation_text=conversation_text
     )
 
     # Use Sonnet 4.5 for distillation (fast, cheap, excellent at structured extraction)
-    response = anthropic_client.messages.create(
+    # Streamed: text deltas are collected as they arrive and joined once
+    with anthropic_client.messages.stream(
         model="claude-sonnet-4-5-20250929",
         max_tokens=3000,  # Increased for detailed extraction (was 2000)
         temperature=0.3,  # Lower temp for more factual extraction
         messages=[{
             "role": "user",
-            "content": distillation_prompt
+            "content": [
+                {"type": "text", "text": REFINEMENT_DISTILLATION_STATIC, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": distillation_input}
+            ]
         }]
-    )
+    ) as stream:
+        distilled = "".join(stream.text_stream)
+        response = stream.get_final_message()
 
-    distilled = ""
-    for block in response.content:
-        if block.type == "text":
-            distilled += block.text
+    log_usage("Distillation", response)
 
     return distilled.strip()
 
 
+# Page-cache hints for research file reads (not available on Windows/macOS)
+FADVISE = hasattr(os, "posix_fadvise")
+
+
+def read_file_body(filepath: str, header_lines: int = 0) -> Optional[str]:
+    """
+    Read a research file, dropping its metadata header.
+
+    Args:
+        filepath: File to read
+        header_lines: Number of leading metadata lines to skip
+
+    Returns:
+        File body, or None if the file doesn't exist
+
+    Why: Opening directly (instead of exists + open) saves a stat per file and
+    makes this safe to fan out across threads when loading an episode.
+
+    On POSIX the kernel is told the file is read once, front to back, and its
+    pages are dropped afterwards so bulk migrations don't flood the page cache.
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            if FADVISE:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            lines = f.readlines()
+            if FADVISE:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except FileNotFoundError:
+        return None
+    return ''.join(lines[header_lines:]) if len(lines) > header_lines else ''.join(lines)
+
+
 def load_research_files(research_dir: str) -> Dict[str, str]:
     """
     Load all research files from episode directory.
@@ -214,34 +338,31 @@ def load_research_files(research_dir: str) -> Dict[str, str]:
     Returns:
         Dict with keys: academic_researcher, industry_intelligence, tool_analyzer,
                        critical_analysis, narrative, refinement_distilled
+        (metadata headers stripped; missing files are left out)
 
     Why: Used during migration to load old research and commit to graph.
     """
     files = {}
 
-    # Load 3 workers
-    for worker in ["academic_researcher", "industry_intelligence", "tool_analyzer"]:
-        filepath = os.path.join(research_dir, f"{worker}.txt")
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                files[worker] = f.read()
-
-    # Load critical analysis
-    critical_path = os.path.join(research_dir, "critical_analysis.txt")
-    if os.path.exists(critical_path):
-        with open(critical_path, 'r', encoding='utf-8') as f:
-            files["critical_analysis"] = f.read()
-
-    # Load narrative
-    narrative_path = os.path.join(research_dir, "narrative.txt")
-    if os.path.exists(narrative_path):
-        with open(narrative_path, 'r', encoding='utf-8') as f:
-            files["narrative"] = f.read()
-
-    # Load refinement distilled
-    distilled_path = os.path.join(research_dir, "refinement_distilled.txt")
-    if os.path.exists(distilled_path):
-        with open(distilled_path, 'r', encoding='utf-8') as f:
-            files["refinement_distilled"] = f.read()
+    # key -> (file name, metadata header lines to skip)
+    names = {
+        "academic_researcher": ("academic_researcher.txt", 4),
+        "industry_intelligence": ("industry_intelligence.txt", 4),
+        "tool_analyzer": ("tool_analyzer.txt", 4),
+        "critical_analysis": ("critical_analysis.txt", 2),
+        "narrative": ("narrative.txt", 0),
+        "refinement_distilled": ("refinement_distilled.txt", 0),
+    }
+
+    # Independent reads: fan out instead of opening one file at a time
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        contents = pool.map(
+            read_file_body,
+            (os.path.join(research_dir, name) for name, _ in names.values()),
+            (header_lines for _, header_lines in names.values())
+        )
+        for key, content in zip(names, contents):
+            if content is not None:
+                files[key] = content
 
     return files
@@ -0,0 +1,135 @@
+"""
+Anthropic client and response helpers.
+
+Shared by main.py, workers and utils so every call site reuses the same
+client (one connection pool) and extracts text the same way.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import httpx
+from anthropic import Anthropic, AsyncAnthropic, DefaultAsyncHttpxClient, DefaultHttpxClient
+from dotenv import load_dotenv
+
+# Load environment variables from .env file (once here: modules that only
+# need the Anthropic key get it through this import, not their own .env parse)
+load_dotenv()
+
+# Shared async client: keep-alive connections and TLS sessions are reused
+# across calls instead of paying a handshake per request
+async_anthropic_client = AsyncAnthropic(
+    api_key=os.environ.get("ANTHROPIC_API_KEY"),
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    )
+)
+
+# Shared sync client for code that runs on worker threads (batch creation,
+# structuring, critical analyst, distillation) - one pool instead of one per module
+anthropic_client = Anthropic(
+    api_key=os.environ.get("ANTHROPIC_API_KEY"),
+    http_client=DefaultHttpxClient(
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+    )
+)
+
+
+def response_text(response) -> str:
+    """
+    Concatenate all text blocks of an Anthropic message response.
+
+    Why: Responses can hold several text blocks (e.g. interleaved with
+    web_search tool blocks). Joining once avoids repeated string += and
+    keeps every block, not just the last one.
+    """
+    return "".join(block.text for block in response.content if block.type == "text")
+
+
+def tool_input(response, tool_name: str) -> dict:
+    """Return the input dict of the named tool_use block (empty dict if missing)."""
+    for block in response.content:
+        if block.type == "tool_use" and block.name == tool_name:
+            return block.input
+    return {}
+
+
+# Per-call token usage log (session_dir/usage.jsonl). Rows recorded before the
+# session directory exists (tasking, naming) are buffered until set_usage_log()
+_usage_log_path = None
+_usage_buffer = []
+
+# Set HELLDIVER_TOKEN_LOGS=1 to print usage for every call, not just cached ones
+_PRINT_ALL_USAGE = os.environ.get("HELLDIVER_TOKEN_LOGS") == "1"
+
+
+def set_usage_log(session_dir: str):
+    """Start appending usage rows to session_dir/usage.jsonl (flushes buffered rows)."""
+    global _usage_log_path
+    _usage_log_path = os.path.join(session_dir, "usage.jsonl")
+    if _usage_buffer:
+        with open(_usage_log_path, 'a', encoding='utf-8') as f:
+            f.writelines(_usage_buffer)
+        _usage_buffer.clear()
+
+
+def log_usage(label: str, response) -> None:
+    """
+    Record token usage for one Anthropic response.
+
+    Why: Prompt caching only pays off if later calls actually read the cache.
+    Logging cache reads next to cache writes makes hit rates (and
+    cache-busting prompt changes) visible.
+
+    Prints a [TOKENS] line when the cache was read or written (every call
+    with HELLDIVER_TOKEN_LOGS=1) and appends a row to usage.jsonl.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+
+    row = {
+        "timestamp": datetime.now().isoformat(),
+        "label": label,
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+    }
+
+    if _PRINT_ALL_USAGE or row["cache_read_input_tokens"] or row["cache_creation_input_tokens"]:
+        print(f"[TOKENS] {label}: in={row['input_tokens']} cached_read={row['cache_read_input_tokens']} "
+              f"cache_write={row['cache_creation_input_tokens']} out={row['output_tokens']}")
+
+    line = json.dumps(row) + "\n"
+    if _usage_log_path is None:
+        _usage_buffer.append(line)
+        return
+    try:
+        with open(_usage_log_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+    except OSError as e:
+        print(f"[WARN] Could not write usage log: {e}")
+
+
+async def stream_message(**kwargs):
+    """
+    Create a message, printing its text to the console as it streams in.
+
+    Args:
+        **kwargs: Same arguments as messages.create
+
+    Returns:
+        The final Message (usage and content, same as messages.create)
+
+    Why: Long user-facing answers otherwise show nothing until the last
+    token arrives. Streaming shows the first words after ~1s while total
+    time stays the same.
+    """
+    async with async_anthropic_client.messages.stream(**kwargs) as stream:
+        async for text in stream.text_stream:
+            print(text, end="", flush=True)
+        message = await stream.get_final_message()
+    print()
+    return message
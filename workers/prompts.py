@@ -657,3 +657,8 @@ THIS IS THE GOLD. Every sentence you write should be worth committing to permane
 <instructions>
 Extract the strategic gold from the conversation above. Focus on mental models, reframings, constraints, priorities, and synthesis instructions. Write entity-rich, graph-optimized output.
 </instructions>"""
+
+# Static extraction rules vs. the conversation being distilled. Distillation runs
+# once per research cycle, so the rules are the only part worth caching.
+REFINEMENT_DISTILLATION_STATIC, _, _distillation_input = REFINEMENT_DISTILLATION_PROMPT.rpartition("<conversation>")
+REFINEMENT_DISTILLATION_INPUT_TEMPLATE = "<conversation>" + _distillation_input
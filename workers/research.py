@@ -12,11 +12,17 @@ Uses batch API for:
 """
 
 import os
+import re
+import json
 import time
+import random
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Tuple
-from anthropic import Anthropic
-from dotenv import load_dotenv
+from typing import Dict, Optional, Tuple
+from anthropic import APIConnectionError, APIStatusError
 from workers.prompts import (
     ACADEMIC_RESEARCHER_PROMPT,
     INDUSTRY_ANALYST_PROMPT,
@@ -24,18 +30,59 @@ from workers.prompts import (
     STRUCTURING_PROMPT_TEMPLATE,
     CRITICAL_ANALYST_PROMPT,
 )
+# Shared clients from utils.llm (batch polling uses the async one so the event
+# loop stays free while workers run)
+from utils.llm import anthropic_client, async_anthropic_client, response_text, log_usage
+from utils.files import write_file
 
-# Load environment variables
-load_dotenv()
-
-# Initialize Anthropic client
-anthropic_client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+# Header separator for saved worker/critical files (built once)
+SEPARATOR_LINE = "=" * 80
 
 # Test mode flag (set by main.py)
 TEST_MODE = False
 
+# Batch polling backoff bounds (seconds): 2 -> 4 -> 8 -> 16 -> 30 -> 30 ...
+POLL_MIN_DELAY = 2
+POLL_MAX_DELAY = 30
+
+# Upper bound on waiting for a batch (seconds). Research batches normally end
+# in minutes; past this something is stuck, so fail instead of hanging forever.
+BATCH_TIMEOUT = int(os.environ.get("HELLDIVER_BATCH_TIMEOUT", "1800"))
+
+# Stage 1 *_raw.txt dumps are an audit copy only (nothing reads them back);
+# HELLDIVER_SAVE_RAW=0 skips them
+SAVE_RAW_RESEARCH = os.environ.get("HELLDIVER_SAVE_RAW", "1") != "0"
+
+# Opt-in: run Stage 2 structuring as a Batch API job (50% cheaper, slower)
+BATCH_STRUCTURING = os.environ.get("HELLDIVER_BATCH_STRUCTURING") == "1"
+
+# Transient status-check failures (429/5xx/network) are retried with backoff;
+# after this many in a row the run stops (--resume-research picks the batch up)
+RETRIEVE_MAX_ATTEMPTS = 10
+
+# Written right after batch submission, removed once results are processed.
+# If the process dies mid-poll, `main.py --resume-research <session_dir>` re-runs
+# the cycle and resumes this batch instead of submitting a new one.
+BATCH_STATE_FILE = "batch_state.json"
 
-def execute_research(query: str, tasking_summary: str, research_dir: str) -> Tuple[Dict[str, str], str]:
+# Machine-readable poll log (one JSON object per status check)
+BATCH_PROGRESS_FILE = "batch_progress.jsonl"
+
+# Opt-in research result cache (HELLDIVER_RESEARCH_CACHE=1) for dev/test cycles:
+# an identical query + tasking context reuses the earlier worker/critical output
+# instead of paying for another batch. One JSON file per content hash.
+RESEARCH_CACHE = os.environ.get("HELLDIVER_RESEARCH_CACHE") == "1"
+RESEARCH_CACHE_DIR = os.path.join("context", "_research_cache")
+
+# Opt-in analyst triage (HELLDIVER_ANALYST_TRIAGE=1): Haiku reviews first and its
+# analysis is kept when every worker scores >= TRIAGE_MIN_SCORE; otherwise the
+# batch is weak enough to deserve the full Sonnet review.
+ANALYST_TRIAGE = os.environ.get("HELLDIVER_ANALYST_TRIAGE") == "1"
+TRIAGE_MIN_SCORE = 7
+RELEVANCE_SCORE_RE = re.compile(r"(\d+)\s*/\s*10")
+
+
+async def execute_research(query: str, tasking_summary: str, research_dir: str) -> Tuple[Dict[str, str], str]:
     """
     Execute full research cycle using batch API.
 
@@ -51,61 +98,305 @@ def execute_research(query: str, tasking_summary: str, research_dir: str) -> Tup
 
     Process:
         1. Create batch with 3 workers
-        2. Poll with progress updates every 30s
-        3. Extract results and save to files
-        4. Run critical analyst
+        2. Poll with backoff (2s -> 30s), progress updates every 30s
+        3. Extract results and save raw files, starting each worker's structuring as its result arrives
+        4. Run critical analyst once all raw findings are in (alongside the structuring calls)
         5. Return all findings
 
     Why batch API:
     - 50% cost savings vs regular API
     - Can poll for progress
     - Optimal per Anthropic docs
+
+    Why async:
+    - Polling takes 3-5 minutes; asyncio.sleep lets other tasks run meanwhile
     """
     print(f"[RESEARCH] Starting research on: {query}")
-    print("[BATCH] Creating research batch...")
 
-    # Create batch with 3 workers
-    batch = create_worker_batch(query, tasking_summary)
+    cache_path = _research_cache_path(query, tasking_summary) if RESEARCH_CACHE else None
+    cached = _load_cached_research(cache_path) if cache_path else None
+    if cached:
+        print("[CACHE] Same query + tasking context researched before - reusing results")
+        worker_results, critical_analysis = cached
+        await asyncio.to_thread(_write_cached_research_files, research_dir, worker_results, critical_analysis)
+        return worker_results, critical_analysis
+
+    # A batch from an interrupted run of this same research keeps running
+    # server-side - pick it up instead of paying for a second one
+    state = _pending_batch_state(research_dir, query)
+    if state:
+        batch_id = state["batch_id"]
+        # The workers ran with the stored context (tasking summaries are
+        # LLM-generated and differ run to run) - the analyst reviews against it too
+        tasking_summary = state.get("tasking_summary", tasking_summary)
+        print(f"[RESUME] Found unfinished batch {batch_id} from an interrupted run - resuming")
+    else:
+        print("[BATCH] Creating research batch...")
+
+        # Create batch with 3 workers
+        batch_id = create_worker_batch(query, tasking_summary).id
+        _save_batch_state(research_dir, batch_id, query, tasking_summary)
 
-    print(f"[SUBMITTED] Batch {batch.id}")
+        print(f"[SUBMITTED] Batch {batch_id}")
     print("[WORKERS] Academic | Industry | Tool")
     print()
 
     # Poll with progress updates every 30s
-    start_time = time.time()
+    start_time = time.monotonic()  # Immune to wall-clock (NTP) jumps
     update_interval = 30
     last_update = 0
+    delay = POLL_MIN_DELAY
+    last_succeeded = 0
 
     while True:
-        batch_status = anthropic_client.messages.batches.retrieve(batch.id)
+        batch_status = await _retrieve_batch(batch_id, research_dir)
 
         if batch_status.processing_status == "ended":
             print("[COMPLETE] All workers finished!")
             break
 
-        elapsed = int(time.time() - start_time)
+        elapsed = int(time.monotonic() - start_time)
+        counts = batch_status.request_counts
+        _log_batch_progress(research_dir, batch_id, elapsed, counts)
+
+        # Batch keeps running server-side and batch_state.json stays, so
+        # --resume-research can pick it up later rather than paying again
+        if elapsed > BATCH_TIMEOUT:
+            print(f"[TIMEOUT] Batch {batch_id} still running after {BATCH_TIMEOUT}s - "
+                  f"resume it later with: {_resume_command(research_dir)}")
+            raise TimeoutError(f"Batch {batch_id} exceeded {BATCH_TIMEOUT}s")
 
         # Show progress every 30s (max 6 updates = 3 minutes)
         if elapsed - last_update >= update_interval and elapsed // update_interval <= 6:
-            counts = batch_status.request_counts
             print(f"[PROGRESS] {elapsed}s elapsed - Processing: {counts.processing} | Complete: {counts.succeeded}")
             last_update = elapsed
 
-        time.sleep(10)  # Poll every 10s
+        # Exponential backoff: quick checks early, fewer calls on long batches.
+        # A newly finished worker means the rest are likely close - poll fast again.
+        if counts.succeeded > last_succeeded:
+            last_succeeded = counts.succeeded
+            delay = POLL_MIN_DELAY
+        await asyncio.sleep(delay + random.uniform(0, 1))  # Jitter; doesn't block the event loop
+        delay = min(POLL_MAX_DELAY, delay * 2)
 
     print()
 
-    # Extract results and save to files
+    # Extract results and save raw files. Each worker's structuring call starts
+    # as soon as its findings stream in, while later results are still fetched
     print("[EXTRACTING] Gathering findings from workers...")
-    worker_results = extract_batch_results(batch.id, research_dir)
+    raw_results = {}
+    structuring = {}  # custom_id -> structuring task (live structuring only)
+    results = stream_batch_results(batch_id, research_dir)
+    # Each blocking fetch runs in a thread, so the event loop stays free
+    while (item := await asyncio.to_thread(next, results, None)) is not None:
+        custom_id, findings = item
+        raw_results[custom_id] = findings
+        if not BATCH_STRUCTURING:
+            print(f"[STRUCTURING] {custom_id} for graph extraction...")
+            structuring[custom_id] = asyncio.create_task(
+                asyncio.to_thread(structure_research_for_graph, findings, custom_id, research_dir)
+            )
+
+    # The critical analyst needs every worker's raw findings but not the
+    # structured ones, so the Sonnet review runs alongside the Haiku structuring calls
+    print("[CRITICAL] Running critical analyst alongside structuring...")
+    structuring_done = threading.Event()  # Analyst holds its console stream until set
+
+    async def structure_then_release_console():
+        try:
+            if BATCH_STRUCTURING:
+                # One discounted Stage 2 batch once all raw findings are in
+                return await asyncio.to_thread(structure_research_batch, raw_results, research_dir)
+            # Worker order, not completion order
+            return dict(zip(structuring, await asyncio.gather(*structuring.values())))
+        finally:
+            structuring_done.set()
+
+    worker_results, critical_analysis = await asyncio.gather(
+        structure_then_release_console(),
+        asyncio.to_thread(run_critical_analyst, raw_results, query, tasking_summary, research_dir,
+                          structuring_done)
+    )
+
+    if cache_path:
+        await asyncio.to_thread(_store_cached_research, cache_path, worker_results, critical_analysis)
 
-    # Run critical analyst
-    print("[CRITICAL] Running critical analyst...")
-    critical_analysis = run_critical_analyst(worker_results, query, tasking_summary, research_dir)
+    # All batch output is on disk now - nothing left to resume
+    _clear_batch_state(research_dir)
 
     return worker_results, critical_analysis
 
 
+def _log_batch_progress(research_dir: str, batch_id: str, elapsed: int, counts):
+    """
+    Append one poll's status as a JSON line to research_dir/batch_progress.jsonl.
+
+    Why: The [PROGRESS] prints are for the user and only every 30s. A JSONL
+    record per poll lets another process (tail -f, a dashboard) follow the
+    batch without scraping console output.
+    """
+    event = {
+        "timestamp": datetime.now().isoformat(),
+        "batch_id": batch_id,
+        "elapsed": elapsed,
+        "processing": counts.processing,
+        "succeeded": counts.succeeded,
+        "errored": counts.errored,
+    }
+    with open(os.path.join(research_dir, BATCH_PROGRESS_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(event) + "\n")
+
+
+async def _retrieve_batch(batch_id: str, research_dir: str):
+    """
+    Fetch batch status, retrying transient API errors with exponential backoff.
+
+    Why: A single 429/502 during a multi-minute poll would otherwise abort the
+    whole research cycle even though the batch itself is fine server-side.
+    """
+    delay = 2
+    for attempt in range(1, RETRIEVE_MAX_ATTEMPTS + 1):
+        try:
+            return await async_anthropic_client.messages.batches.retrieve(batch_id)
+        except (APIStatusError, APIConnectionError) as e:
+            # 4xx other than rate limits (bad id, auth) won't fix themselves
+            status = getattr(e, "status_code", None)
+            if status is not None and status != 429 and status < 500:
+                raise
+            if attempt == RETRIEVE_MAX_ATTEMPTS:
+                print(f"[FAILED] Batch status unavailable after {attempt} attempts - "
+                      f"resume batch {batch_id} later with: {_resume_command(research_dir)}")
+                raise
+            print(f"[RETRY] Batch status check failed ({e.__class__.__name__}), "
+                  f"retrying in {delay}s ({attempt}/{RETRIEVE_MAX_ATTEMPTS})...")
+            await asyncio.sleep(delay)
+            delay = min(60, delay * 2)
+
+
+def _resume_command(research_dir: str) -> str:
+    """CLI command that resumes this episode's saved batch (session dir = parent of research_dir)."""
+    return f'python main.py --resume-research "{os.path.dirname(os.path.normpath(research_dir))}"'
+
+
+def _pending_batch_state(research_dir: str, query: str):
+    """
+    Return the batch state saved by an interrupted run of the same research, if any.
+
+    Keyed on directory + query only: the tasking summary is regenerated by an
+    LLM on every run, so it would almost never match. The stored summary is
+    reused instead.
+    """
+    try:
+        with open(os.path.join(research_dir, BATCH_STATE_FILE), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if state.get("query") != query or not state.get("batch_id"):
+        return None
+    return state
+
+
+def find_interrupted_research(session_dir: str) -> list:
+    """
+    List batch states left behind by interrupted research in a session.
+
+    Args:
+        session_dir: Session folder (each research episode is a subdirectory)
+
+    Returns:
+        State dicts (batch_id, query, tasking_summary, research_dir, started_at),
+        oldest first
+
+    Why: Used by --resume-research to re-run those cycles, which then pick up
+    the stored batch instead of submitting a new one.
+    """
+    states = []
+    with os.scandir(session_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            try:
+                with open(os.path.join(entry.path, BATCH_STATE_FILE), 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            if state.get("batch_id") and state.get("query"):
+                states.append(state)
+    return sorted(states, key=lambda state: state.get("started_at", ""))
+
+
+def _save_batch_state(research_dir: str, batch_id: str, query: str, tasking_summary: str):
+    """Record the submitted batch so a killed run can resume polling it."""
+    state = {
+        "batch_id": batch_id,
+        "query": query,
+        "tasking_summary": tasking_summary,
+        "research_dir": research_dir,
+        "started_at": datetime.now().isoformat(),
+    }
+    with open(os.path.join(research_dir, BATCH_STATE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def _clear_batch_state(research_dir: str):
+    """Remove the resume record once the batch's results are fully processed."""
+    try:
+        os.remove(os.path.join(research_dir, BATCH_STATE_FILE))
+    except FileNotFoundError:
+        pass
+
+
+def _research_cache_path(query: str, tasking_summary: str) -> str:
+    """Cache file for this query + tasking context (model included: test mode differs)."""
+    model = "claude-haiku-4-5" if TEST_MODE else "claude-sonnet-4-5"
+    key = hashlib.sha256(f"{query}\x00{tasking_summary}\x00{model}".encode('utf-8')).hexdigest()
+    return os.path.join(RESEARCH_CACHE_DIR, f"{key}.json")
+
+
+def _load_cached_research(cache_path: str):
+    """Return (worker_results, critical_analysis) from the cache, or None on a miss."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return entry["worker_results"], entry["critical_analysis"]
+
+
+def _store_cached_research(cache_path: str, worker_results: dict, critical_analysis: str):
+    """Save research output under its content hash (temp file + rename, never torn)."""
+    os.makedirs(RESEARCH_CACHE_DIR, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"worker_results": worker_results, "critical_analysis": critical_analysis}, f)
+    os.replace(tmp_path, cache_path)
+
+
+def _write_cached_research_files(research_dir: str, worker_results: dict, critical_analysis: str):
+    """Write worker/critical files for a cache hit, in the same format as a live run."""
+    for worker_type, structured_output in worker_results.items():
+        write_file(os.path.join(research_dir, f"{worker_type}.txt"), _structured_header(worker_type) + structured_output)
+    write_file(os.path.join(research_dir, "critical_analysis.txt"), _critical_header() + critical_analysis)
+
+
+# Worker request building blocks, built once at import instead of per batch.
+# No cache_control: each persona prompt is under Sonnet's 1024-token minimum
+# cacheable length, so a breakpoint here would be ignored by the API.
+WORKER_SYSTEMS = {
+    "academic_researcher": ACADEMIC_RESEARCHER_PROMPT,
+    "industry_intelligence": INDUSTRY_ANALYST_PROMPT,
+    "tool_analyzer": TOOL_ANALYZER_PROMPT,
+}
+WEB_SEARCH_TOOLS = [{"type": "web_search_20250305", "name": "web_search"}]
+
+# Test mode: minimal research for fast testing
+TEST_WORKER_SYSTEMS = {
+    "academic_researcher": "You are an academic researcher. Provide 2-3 key points about this topic.",
+    "industry_intelligence": "You are an industry analyst. Provide 2-3 key real-world insights.",
+    "tool_analyzer": "You are a tools researcher. Provide 2-3 key technical points.",
+}
+
+
 def create_worker_batch(research_query: str, tasking_context: str):
     """
     Create batch jobs for 3 specialist workers.
@@ -119,18 +410,14 @@ def create_worker_batch(research_query: str, tasking_context: str):
 
     # Test mode: minimal research for fast testing
     if TEST_MODE:
-        academic_prompt = "You are an academic researcher. Provide 2-3 key points about this topic."
-        industry_prompt = "You are an industry analyst. Provide 2-3 key real-world insights."
-        tool_prompt = "You are a tools researcher. Provide 2-3 key technical points."
+        systems = TEST_WORKER_SYSTEMS
         user_message = f"Research Query: {research_query}\n\nProvide brief, focused insights (2-3 points max)."
         model = "claude-haiku-4-5"
         max_tokens = 500
         tools = []  # No web search in test mode
     else:
         # Use elite optimized prompts from prompts.py
-        academic_prompt = ACADEMIC_RESEARCHER_PROMPT
-        industry_prompt = INDUSTRY_ANALYST_PROMPT
-        tool_prompt = TOOL_ANALYZER_PROMPT
+        systems = WORKER_SYSTEMS
 
         user_message = f"""<research_query>
 {research_query}
@@ -145,43 +432,20 @@ Conduct deep research using your specialized expertise. Use web_search extensive
 </instructions>"""
         model = "claude-sonnet-4-5"
         max_tokens = 4000
-        tools = [{"type": "web_search_20250305", "name": "web_search"}]
-
+        tools = WEB_SEARCH_TOOLS
+
+    # Shared params built once; each worker request only adds its system prompt
+    base_params = {
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": 0.3,
+        "tools": tools,
+        "messages": [{"role": "user", "content": user_message}]
+    }
     batch = anthropic_client.messages.batches.create(
         requests=[
-            {
-                "custom_id": "academic_researcher",
-                "params": {
-                    "model": model,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.3,
-                    "system": academic_prompt,
-                    "tools": tools,
-                    "messages": [{"role": "user", "content": user_message}]
-                }
-            },
-            {
-                "custom_id": "industry_intelligence",
-                "params": {
-                    "model": model,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.3,
-                    "system": industry_prompt,
-                    "tools": tools,
-                    "messages": [{"role": "user", "content": user_message}]
-                }
-            },
-            {
-                "custom_id": "tool_analyzer",
-                "params": {
-                    "model": model,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.3,
-                    "system": tool_prompt,
-                    "tools": tools,
-                    "messages": [{"role": "user", "content": user_message}]
-                }
-            }
+            {"custom_id": custom_id, "params": base_params | {"system": system}}
+            for custom_id, system in systems.items()
         ]
     )
 
@@ -204,6 +468,18 @@ def structure_research_for_graph(raw_research: str, worker_type: str, research_d
         Structured research with entity markers and relationship declarations
     """
 
+    response = anthropic_client.messages.create(**_structuring_params(raw_research, worker_type))
+
+    log_usage(f"Structuring {worker_type}", response)
+
+    structured_output = response_text(response)
+    _save_structured(research_dir, worker_type, structured_output)
+
+    return structured_output
+
+
+def _structuring_params(raw_research: str, worker_type: str) -> dict:
+    """Request params for one Stage 2 structuring call (shared by live and batch paths)."""
     # Use elite optimized structuring prompt (XML tags, examples, clear rules)
     structuring_prompt = STRUCTURING_PROMPT_TEMPLATE.format(
         worker_type=worker_type,
@@ -211,76 +487,156 @@ def structure_research_for_graph(raw_research: str, worker_type: str, research_d
     )
 
     # Use cheaper model for structured task (Haiku is excellent at following formats)
-    response = anthropic_client.messages.create(
-        model="claude-haiku-4-5",  # Cost-effective for structured transformation
-        max_tokens=6000,  # Slightly longer to ensure no truncation
-        temperature=0,  # Deterministic for formatting
-        messages=[{"role": "user", "content": structuring_prompt}]
-    )
+    return {
+        "model": "claude-haiku-4-5",  # Cost-effective for structured transformation
+        "max_tokens": 6000,  # Slightly longer to ensure no truncation
+        "temperature": 0,  # Deterministic for formatting
+        "messages": [{"role": "user", "content": structuring_prompt}]
+    }
 
-    structured_output = ""
-    for block in response.content:
-        if block.type == "text":
-            structured_output += block.text
 
-    # Save structured version
+def _save_structured(research_dir: str, worker_type: str, structured_output: str):
+    """Save a worker's structured (graph-optimized) version."""
     structured_file = os.path.join(research_dir, f"{worker_type}.txt")
-    with open(structured_file, 'w', encoding='utf-8') as f:
-        f.write(f"Worker: {worker_type}\n")
-        f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-        f.write(f"Format: Graph-optimized (Stage 2 - structured from raw research)\n")
-        f.write("="*80 + "\n\n")
-        f.write(structured_output)
-
-    return structured_output
+    write_file(structured_file, _structured_header(worker_type) + structured_output)  # Atomic, one write
 
 
-def extract_batch_results(batch_id: str, research_dir: str) -> dict:
+def structure_research_batch(raw_results: Dict[str, str], research_dir: str) -> Dict[str, str]:
     """
-    Extract results from completed batch and save to research directory.
+    Stage 2 for all workers as one Batch API job (HELLDIVER_BATCH_STRUCTURING=1).
 
-    TWO-STAGE PROCESSING:
-    Stage 1: Save raw natural research (what the research LLM produced)
-    Stage 2: Transform into graph-optimized format (entity naming + relationships)
+    Args:
+        raw_results: {worker_type: raw findings} from Stage 1
+        research_dir: Where to save structured output
+
+    Returns:
+        {worker_type: structured research}, in raw_results order
+
+    Why: Batch pricing halves the structuring cost. The trade-off is latency -
+    batches can take minutes where the three concurrent live calls take
+    seconds - so this is opt-in. Any worker whose batch entry fails is
+    structured with a live call, so a partial batch never loses findings.
 
-    This separation ensures research quality isn't constrained by formatting requirements.
+    Runs on a worker thread (via asyncio.to_thread in execute_research), so blocking sleeps are fine.
     """
-    results = {}
+    batch = anthropic_client.messages.batches.create(
+        requests=[
+            {"custom_id": worker_type, "params": _structuring_params(raw_research, worker_type)}
+            for worker_type, raw_research in raw_results.items()
+        ]
+    )
+    print(f"[STRUCTURING] Batch {batch.id} submitted for {len(raw_results)} workers...")
+
+    delay = POLL_MIN_DELAY
+    deadline = time.monotonic() + BATCH_TIMEOUT
+    timed_out = False
+    while anthropic_client.messages.batches.retrieve(batch.id).processing_status != "ended":
+        if time.monotonic() > deadline:
+            # Nothing to resume here - cancel and let the live fallback below finish
+            print(f"[TIMEOUT] Structuring batch {batch.id} exceeded {BATCH_TIMEOUT}s - cancelling")
+            anthropic_client.messages.batches.cancel(batch.id)
+            timed_out = True
+            break
+        time.sleep(delay + random.uniform(0, 1))
+        delay = min(POLL_MAX_DELAY, delay * 2)
 
-    for result in anthropic_client.messages.batches.results(batch_id):
+    structured = {}
+    # Results are only readable once a batch has ended (not while it cancels)
+    for result in ([] if timed_out else anthropic_client.messages.batches.results(batch.id)):
         if result.result.type == "succeeded":
-            custom_id = result.custom_id
+            worker_type = result.custom_id
             message = result.result.message
+            log_usage(f"Structuring {worker_type}", message)
+            structured[worker_type] = response_text(message)
+            _save_structured(research_dir, worker_type, structured[worker_type])
 
-            findings = ""
-            for block in message.content:
-                if block.type == "text":
-                    findings += block.text
-
-            # STAGE 1: Save raw research (natural prose)
-            raw_file = os.path.join(research_dir, f"{custom_id}_raw.txt")
-            with open(raw_file, 'w', encoding='utf-8') as f:
-                f.write(f"Worker: {custom_id}\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                f.write(f"Batch ID: {batch_id}\n")
-                f.write(f"Format: Natural research (Stage 1 - before structuring)\n")
-                f.write("="*80 + "\n\n")
-                f.write(findings)
-
-            # STAGE 2: Transform for graph extraction
-            print(f"[STRUCTURING] {custom_id} for graph extraction...")
-            structured_findings = structure_research_for_graph(findings, custom_id, research_dir)
+    for worker_type, raw_research in raw_results.items():
+        if worker_type not in structured:
+            print(f"[STRUCTURING] Batch entry for {worker_type} failed - retrying live...")
+            structured[worker_type] = structure_research_for_graph(raw_research, worker_type, research_dir)
+
+    return {worker_type: structured[worker_type] for worker_type in raw_results}
+
+
+def _structured_header(worker_type: str) -> str:
+    """Metadata header for a worker's Stage 2 (graph-optimized) file."""
+    return (
+        f"Worker: {worker_type}\n"
+        f"Timestamp: {datetime.now().isoformat()}\n"
+        f"Format: Graph-optimized (Stage 2 - structured from raw research)\n"
+        + SEPARATOR_LINE + "\n\n"
+    )
 
-            results[custom_id] = structured_findings  # Return structured version for graph
 
-    return results
+def _critical_header() -> str:
+    """Metadata header for critical_analysis.txt."""
+    return f"CRITICAL ANALYSIS\nTimestamp: {datetime.now().isoformat()}\n" + SEPARATOR_LINE + "\n\n"
 
 
-def run_critical_analyst(worker_results: dict, research_query: str, tasking_context: str, research_dir: str) -> str:
+def _write_raw_file(raw_file: str, custom_id: str, batch_id: str, findings: str):
+    """Write a worker's Stage 1 (natural prose) research with its metadata header."""
+    header = (
+        f"Worker: {custom_id}\n"
+        f"Timestamp: {datetime.now().isoformat()}\n"
+        f"Batch ID: {batch_id}\n"
+        f"Format: Natural research (Stage 1 - before structuring)\n"
+        + SEPARATOR_LINE + "\n\n"
+    )
+    write_file(raw_file, header + findings)  # Atomic, one write
+
+
+def stream_batch_results(batch_id: str, research_dir: str):
+    """
+    Yield (custom_id, findings) for each succeeded worker as results stream in.
+
+    TWO-STAGE PROCESSING:
+    Stage 1: Save raw natural research (what the research LLM produced) - here
+    Stage 2: Transform into graph-optimized format (structure_research_for_graph),
+    started by execute_research for each yielded result
+
+    Stage 1 raw files are written on a pool, so disk I/O overlaps with
+    fetching the next result instead of blocking the consumer. Write errors
+    are re-raised once all results have been streamed.
+    """
+    write_futures = []
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for result in anthropic_client.messages.batches.results(batch_id):
+            if result.result.type == "succeeded":
+                custom_id = result.custom_id
+                message = result.result.message
+
+                findings = response_text(message)
+                log_usage(custom_id, message)
+
+                # STAGE 1: Save raw research (natural prose)
+                if SAVE_RAW_RESEARCH:
+                    raw_file = os.path.join(research_dir, f"{custom_id}_raw.txt")
+                    write_futures.append(pool.submit(_write_raw_file, raw_file, custom_id, batch_id, findings))
+
+                yield custom_id, findings
+
+        for future in write_futures:
+            future.result()  # Surface OSErrors instead of dropping them with the future
+
+
+def run_critical_analyst(
+    worker_results: dict,
+    research_query: str,
+    tasking_context: str,
+    research_dir: str,
+    console_ready: Optional[threading.Event] = None
+) -> str:
     """
     Run critical analyst to review worker findings.
 
     Uses optimized prompt with XML tags and clear evaluation criteria.
+    Reviews the raw (Stage 1) findings: they carry the same insights without
+    entity markers, and don't wait on structuring.
+
+    Args:
+        console_ready: If given, streamed text goes to the file right away but
+            is only echoed to the console once this event is set (so it doesn't
+            interleave with [STRUCTURING]/[TOKENS] lines from other threads)
     """
 
     critical_message = f"""<research_query>
@@ -307,25 +663,73 @@ def run_critical_analyst(worker_results: dict, research_query: str, tasking_cont
 Review all three workers' findings critically. Score relevance, filter noise, identify gaps, challenge weak evidence, and synthesize patterns.
 </instructions>"""
 
+    critical_file = os.path.join(research_dir, "critical_analysis.txt")
+
+    if ANALYST_TRIAGE:
+        triage = _triage_critical_analysis(critical_message)
+        if triage is not None:
+            print(f"[CRITICAL] Haiku triage: all workers scored >= {TRIAGE_MIN_SCORE}/10, keeping its review")
+            write_file(critical_file, _critical_header() + triage)
+            return triage
+        print("[CRITICAL] Low relevance scores in triage - escalating to Sonnet...")
+
+    # Stream the analysis: text is written to disk (and shown, once the console
+    # is free) as it arrives, instead of only after the full 2000-token generation
+    chunks = []
+    printed = 0  # chunks[:printed] already echoed to the console
+    with open(critical_file, 'w', encoding='utf-8') as f:
+        f.write(_critical_header())
+
+        with anthropic_client.messages.stream(
+            model="claude-sonnet-4-5",
+            max_tokens=2000,
+            temperature=0.3,
+            system=CRITICAL_ANALYST_PROMPT,
+            messages=[{"role": "user", "content": critical_message}]
+        ) as stream:
+            for text in stream.text_stream:
+                chunks.append(text)
+                f.write(text)
+                if console_ready is None or console_ready.is_set():
+                    print("".join(chunks[printed:]), end="", flush=True)
+                    printed = len(chunks)
+            response = stream.get_final_message()
+
+    # Finished before structuring: show the rest once the console is free
+    if console_ready is not None:
+        console_ready.wait()
+    print("".join(chunks[printed:]))
+
+    log_usage("Critical analyst", response)
+
+    return "".join(chunks)
+
+
+def _triage_critical_analysis(critical_message: str):
+    """
+    Run the critical analyst on Haiku and keep the result only for strong batches.
+
+    Returns:
+        Haiku's analysis if all three relevance scores are >= TRIAGE_MIN_SCORE,
+        else None (caller escalates to Sonnet)
+
+    Why: Scoring a batch whose workers all clearly answered the query rarely
+    needs Sonnet-class reasoning; Haiku is several times cheaper and faster.
+    """
     response = anthropic_client.messages.create(
-        model="claude-sonnet-4-5",
+        model="claude-haiku-4-5",
         max_tokens=2000,
         temperature=0.3,
         system=CRITICAL_ANALYST_PROMPT,
         messages=[{"role": "user", "content": critical_message}]
     )
+    log_usage("Critical analyst triage", response)
 
-    findings = ""
-    for block in response.content:
-        if block.type == "text":
-            findings += block.text
-
-    # Save critical analysis to file
-    critical_file = os.path.join(research_dir, "critical_analysis.txt")
-    with open(critical_file, 'w', encoding='utf-8') as f:
-        f.write(f"CRITICAL ANALYSIS\n")
-        f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-        f.write("="*80 + "\n\n")
-        f.write(findings)
+    analysis = response_text(response)
 
-    return findings
+    # Only the "## Relevance Scores" section: other sections may quote x/10 too
+    scores_section = analysis.partition("## Relevance Scores")[2].partition("\n## ")[0]
+    scores = [int(score) for score in RELEVANCE_SCORE_RE.findall(scores_section)]
+    if len(scores) >= 3 and min(scores) >= TRIAGE_MIN_SCORE:
+        return analysis
+    return None